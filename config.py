@@ -21,3 +21,27 @@ def get_local_crendentials()-> dict:
         "user":os.getenv("DB_USER"),
         "password":os.getenv("DB_PASSWORD"),
     }
+
+
+def get_pool_settings() -> dict:
+    """Tamanho do pool de conexões compartilhado (src.db.get_shared_engine)."""
+    from dotenv import load_dotenv
+    import os
+    load_dotenv()
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+
+
+def get_http_settings() -> dict:
+    """Cliente HTTP da extração: HTTP_TRANSPORT=requests (HTTP/1.1) ou httpx (HTTP/2)."""
+    from dotenv import load_dotenv
+    import os
+    load_dotenv()
+    return {
+        "transport": os.getenv("HTTP_TRANSPORT", "requests"),
+        "pool_maxsize": int(os.getenv("HTTP_POOL_MAXSIZE", "32")),
+    }
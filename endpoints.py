@@ -1,8 +1,21 @@
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Iterable
+from string import Formatter
+from typing import Optional, Iterable, Iterator
+import re
+import zlib
 from .config import get_base_path
+from .src.compression import OUTPUT_FORMAT_SUFFIXES, suffix_for
+from .src.scanning import DirectoryScanner
+
+@dataclass(frozen=True)
+class ParamsSource:
+  """View that lists the parameters of a dynamic endpoint (one row per request)."""
+  view: str
+  cols: tuple[str, ...]
+  schema: str = "staging"
+  bool_filter: Optional[tuple[str, bool]] = None  # ("has_games_details", False)
 
 @dataclass
 class EndpointConfig:
@@ -15,14 +28,125 @@ class EndpointConfig:
   file_pattern: str = None
   schema: str = 'raw'
   array_key: Optional[str] = None 
+  output_format: str = "json"  # "json", "gzip" ou "zstd" (extra nhl[zstd]); mudar troca o sufixo e recarrega os arquivos
+  copy_format: str = "text"  # "text" ou "binary" (COPY binário direto em JSONB)
+  overwrite_strategy: str = "truncate"  # "truncate", "swap" (staging + rename) ou "merge" (upsert por natural_key)
+  natural_key: Optional[tuple[str, ...]] = None  # campos do template de filename, ex.: ("player_id",)
+  partition_by: Optional[str] = None  # "season", "game_type" ou "hash" (subpastas de output_dir)
+  partition_buckets: int = 64
+  params_source: Optional[ParamsSource] = None  # de onde vêm os parâmetros de url/filename
+
+  def partition_for(self, **params) -> str | None:
+      """Partition subfolder for a request.
+
+      Season and game type come from `season_id`/`game_type_id` when present,
+      otherwise from `game_id` (YYYYTTNNNN: start year, game type, number).
+      """
+      if self.partition_by is None:
+          return None
+      game_id = str(params.get("game_id", ""))
+      if self.partition_by == "season":
+          if "season_id" in params:
+              return str(params["season_id"])
+          if len(game_id) >= 4:
+              start_year = int(game_id[:4])
+              return f"{start_year}{start_year + 1}"
+      elif self.partition_by == "game_type":
+          if "game_type_id" in params:
+              return str(params["game_type_id"])
+          if len(game_id) >= 6:
+              return str(int(game_id[4:6]))
+      elif self.partition_by == "hash":
+          bucket = zlib.crc32(self.filename.format(**params).encode("utf-8")) % self.partition_buckets
+          return f"{bucket:03d}"
+      else:
+          raise ValueError(f"partition_by must be 'season', 'game_type' or 'hash', got '{self.partition_by}'")
+      raise ValueError(f"Cannot derive '{self.partition_by}' partition from {params}")
+
+  def resolve_output_dir(self, **params) -> Path:
+      partition = self.partition_for(**params)
+      return Path(self.output_dir) / partition if partition else Path(self.output_dir)
+
+  def partition_dirs(self, partitions: Iterable[str] | None = None) -> list[Path]:
+      """Folders of the given partitions, or of every existing partition."""
+      base = Path(self.output_dir)
+      if partitions is not None:
+          return [base / str(p) for p in partitions]
+      if not base.is_dir():
+          return []
+      return sorted(d for d in base.iterdir() if d.is_dir() and not d.name.startswith((".", "_")))
+
+  def resolve_filename(self, **params) -> str:
+      """Formats `filename` and appends the compression suffix of `output_format`."""
+      return self.filename.format(**params) + suffix_for(self.output_format)
+
+  def filename_fields(self) -> list[str]:
+      return [field for _, field, _, _ in Formatter().parse(self.filename) if field]
+
+  def filename_regex(self) -> str:
+      """Anchored regex matching `filename` in any output format, one group per template field.
 
-  def collect_files(self, subdirs: Iterable[Path] | None = None) -> list[Path]:
-      roots = list(subdirs) if subdirs else [self.output_dir]
+      Only uses syntax shared by Python `re` and PostgreSQL regexes.
+      """
+      parts = []
+      for literal, field, _, _ in Formatter().parse(self.filename):
+          parts.append(re.sub(r"([.^$*+?()\[\]{}|\\])", r"\\\1", literal))
+          if field:
+              parts.append("(.+)")
+      suffixes = "|".join(re.escape(s) for s in OUTPUT_FORMAT_SUFFIXES.values() if s)
+      return f"^{''.join(parts)}(?:{suffixes})?$"
+
+  def parse_filename(self, name: str) -> dict[str, str] | None:
+      match = re.match(self.filename_regex(), name)
+      return dict(zip(self.filename_fields(), match.groups())) if match else None
+
+  def iter_files(
+      self,
+      subdirs: Iterable[Path] | None = None,
+      use_cache: bool = False,
+      partitions: Iterable[str] | None = None,
+  ) -> Iterator[Path]:
+      """Lazily yields raw files matching `file_pattern` in any output format (.json, .json.gz, .json.zst).
+
+      `partitions` restricts the scan to those partition folders, plus the
+      files of those partitions still in the flat layout (directly in
+      `output_dir`). Partitioned endpoints are always scanned recursively, so
+      without `partitions` flat files are found too. Uses `os.scandir`; with `use_cache`, directory
+      listings are snapshotted in `<output_dir parent>/.scan_cache` and reused
+      while the directory mtime is unchanged and had settled when it was
+      listed (see `DirectoryScanner`).
+      """
+      if partitions is not None:
+          partitions = {str(p) for p in partitions}
+          subdirs = self.partition_dirs(sorted(partitions))
+      roots = list(subdirs) if subdirs is not None else [self.output_dir]
       pattern = self.file_pattern or "*"
-      files: list[Path] = []
+      patterns = [pattern + suffix for suffix in OUTPUT_FORMAT_SUFFIXES.values()]
+      scanner = DirectoryScanner(Path(self.output_dir).parent / ".scan_cache" if use_cache else None)
       for root in roots:
-          files.extend(root.rglob(pattern) if self.search_recursive else root.glob(pattern))
-      return files
+          yield from scanner.iter_files(
+              Path(root),
+              patterns,
+              recursive=self.search_recursive or self.partition_by is not None,
+          )
+      if partitions is not None:
+          # ainda no layout plano (ver src/repartition.py)
+          for path in DirectoryScanner().iter_files(Path(self.output_dir), patterns):
+              params = self.parse_filename(path.name)
+              try:
+                  partition = self.partition_for(**params) if params is not None else None
+              except ValueError:
+                  continue
+              if partition in partitions:
+                  yield path
+
+  def collect_files(
+      self,
+      subdirs: Iterable[Path] | None = None,
+      use_cache: bool = False,
+      partitions: Iterable[str] | None = None,
+  ) -> list[Path]:
+      return list(self.iter_files(subdirs, use_cache=use_cache, partitions=partitions))
 
 ## STATIC ################################################################################
 
@@ -82,6 +206,8 @@ def get_all_games_details_endpoint() -> EndpointConfig:
     output_dir=output_path,
     table_name="nhl_raw_all_games_details",
     file_pattern="raw_*_details.json",
+    partition_by="season",
+    params_source=ParamsSource("vw_stg_request_games_id", ("game_id",), bool_filter=("has_games_details", False)),
     is_overwrite=False
   )
 
@@ -99,6 +225,8 @@ def get_all_games_summary_details_endpoint() -> EndpointConfig:
     output_dir=output_path,
     table_name="nhl_raw_all_games_summary_details",
     file_pattern="raw_*_summary_details.json",
+    partition_by="season",
+    params_source=ParamsSource("vw_stg_request_games_id", ("game_id",), bool_filter=("has_games_summary_details", False)),
     is_overwrite=False
   )
 
@@ -116,7 +244,9 @@ def get_all_club_stats_endpoint() -> EndpointConfig:
     output_dir=output_path,
     table_name="nhl_raw_all_club_stats",
     file_pattern="raw_stats_club_*_*_*.json",
-    is_overwrite=True
+    params_source=ParamsSource("vw_stg_request_teams_seasons_gametypes_id", ("team_id", "season_id", "game_type_id")),
+    is_overwrite=True,
+    overwrite_strategy="swap"
   )
 
 def get_all_players_endpoint() -> EndpointConfig:
@@ -133,7 +263,10 @@ def get_all_players_endpoint() -> EndpointConfig:
     output_dir=output_path,
     table_name="nhl_raw_all_players",
     file_pattern="player_*_info.json",
-    is_overwrite=True
+    params_source=ParamsSource("vw_stg_request_players_id", ("player_id",)),
+    is_overwrite=True,
+    overwrite_strategy="merge",
+    natural_key=("player_id",)
   )
 
 def get_all_players_gamelog_endpoint() -> EndpointConfig:
@@ -151,7 +284,11 @@ def get_all_players_gamelog_endpoint() -> EndpointConfig:
     table_name="nhl_raw_all_player_game_log",
     file_pattern="*_*_*.json",
     search_recursive=True,
-    is_overwrite=True
+    partition_by="season",
+    params_source=ParamsSource("vw_stg_request_players_seasons_gametypes_id", ("player_id", "season_id", "game_type_id")),
+    is_overwrite=True,
+    overwrite_strategy="merge",
+    natural_key=("player_id", "season_id", "game_type_id")
   )
 
 def get_all_games_play_by_play_endpoint() -> EndpointConfig:
@@ -168,5 +305,8 @@ def get_all_games_play_by_play_endpoint() -> EndpointConfig:
     output_dir=output_path,
     table_name="nhl_raw_all_play_by_play",
     file_pattern="raw_*.json",
+    copy_format="binary",
+    partition_by="season",
+    params_source=ParamsSource("vw_stg_request_games_id", ("game_id",), bool_filter=("has_play_by_play", False)),
     is_overwrite=False
   )
@@ -0,0 +1,113 @@
+"""
+Benchmark da serialização do loader (JSON → linhas COPY) num corpus sintético
+de play-by-play. Não precisa de banco.
+
+    python -m local_run.bench_serialization --files 200 --plays 350
+"""
+import argparse
+import json
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from src.loading import serialization
+from src.loading.serialization import iter_copy_rows
+
+
+def _legacy_rows(input_path: Path, array_key: str | None, source_filename: str):
+    """Loop anterior do loader: dumps + loads de validação + 4 replaces por registro."""
+    with input_path.open("r", encoding="utf-8") as f:
+        data = json.loads(f.read())
+    iterable = data[array_key] if array_key else [data]
+    for item in iterable:
+        json_text = json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+        json.loads(json_text)
+        escaped = (
+            json_text
+            .replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+            .replace("\t", "\\t")
+        )
+        yield f"{escaped}\t{source_filename}\n"
+
+
+def _synthetic_game(game_id: int, plays: int, rng: random.Random) -> dict:
+    names = ["Gaudreau", "Pettersson", "Zibanejad", "Hischier", "Ekman-Larsson", "Stützle", "Laine"]
+    return {
+        "id": game_id,
+        "season": 20232024,
+        "gameType": 2,
+        "venue": {"default": "Scotiabank Arena"},
+        "homeTeam": {"id": 10, "abbrev": "TOR", "name": {"default": "Maple Leafs"}},
+        "awayTeam": {"id": 8, "abbrev": "MTL", "name": {"default": "Canadiens"}},
+        "plays": [
+            {
+                "eventId": i,
+                "periodDescriptor": {"number": i % 3 + 1, "periodType": "REG"},
+                "timeInPeriod": f"{rng.randint(0, 19):02d}:{rng.randint(0, 59):02d}",
+                "situationCode": "1551",
+                "typeDescKey": rng.choice(["faceoff", "hit", "shot-on-goal", "blocked-shot", "giveaway"]),
+                "sortOrder": i,
+                "details": {
+                    "xCoord": rng.randint(-99, 99),
+                    "yCoord": rng.randint(-42, 42),
+                    "zoneCode": rng.choice("ODN"),
+                    "playerName": rng.choice(names),
+                    "note": "C:\\rink\\cam\t#2" if i % 50 == 0 else None,
+                },
+            }
+            for i in range(plays)
+        ],
+    }
+
+
+def _run(label: str, rows_fn, files: list[Path], array_key: str) -> float:
+    start = perf_counter()
+    rows = 0
+    for path in files:
+        for _ in rows_fn(path, array_key, path.name):
+            rows += 1
+    elapsed = perf_counter() - start
+    print(f"{label:<28} {rows:>9} rows  {elapsed:7.2f}s  {rows / elapsed:>10.0f} rows/s")
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--plays", type=int, default=350)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for n in range(args.files):
+            path = Path(tmp) / f"raw_{2023020001 + n}.json"
+            path.write_text(json.dumps(_synthetic_game(2023020001 + n, args.plays, rng)), encoding="utf-8")
+            files.append(path)
+
+        # Mesma saída COPY antes e depois
+        legacy = [row.encode("utf-8") for row in _legacy_rows(files[0], "plays", files[0].name)]
+        assert legacy == list(iter_copy_rows(files[0], "plays", files[0].name))
+
+        # Cada jogada é um registro (array_key="plays") para medir o loop por linha
+        before = _run("legacy (dumps+loads+4x)", _legacy_rows, files, "plays")
+
+        orjson = serialization.orjson
+        serialization.orjson = None
+        after_std = _run("one-pass (json)", iter_copy_rows, files, "plays")
+        serialization.orjson = orjson
+
+        if orjson is not None:
+            after = _run("one-pass (orjson)", iter_copy_rows, files, "plays")
+        else:
+            after = after_std
+            print("orjson not installed; skipping orjson run")
+
+        print(f"speedup: {after_std / before:.2f}x (json), {after / before:.2f}x (best)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Compacta os JSONs brutos de cada endpoint em Parquet (um arquivo por partição).
+
+    python -m local_run.compact_parquet
+    python -m local_run.compact_parquet --endpoint play_by_play --seasons 20242025 --force
+"""
+import argparse
+import logging
+from pathlib import Path
+
+from config import get_base_path
+from endpoints import *
+from src.compaction import ParquetCompactor
+
+ENDPOINTS = {
+  "seasons": get_all_seasons_id_endpoint,
+  "teams": get_all_teams_id_endpoint,
+  "games_summary": get_all_games_summary_endpoint,
+  "games_details": get_all_games_details_endpoint,
+  "games_summary_details": get_all_games_summary_details_endpoint,
+  "club_stats": get_all_club_stats_endpoint,
+  "players": get_all_players_endpoint,
+  "gamelog": get_all_players_gamelog_endpoint,
+  "play_by_play": get_all_games_play_by_play_endpoint,
+}
+
+
+if __name__ == '__main__':
+  logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), action="append")
+  parser.add_argument("--seasons", nargs="+", help="partições a compactar (padrão: todas)")
+  parser.add_argument("--force", action="store_true", help="reescreve partições já atualizadas")
+  parser.add_argument("--threads", type=int)
+  args = parser.parse_args()
+
+  compactor = ParquetCompactor(Path(get_base_path()) / 'parquet/nhl', threads=args.threads)
+  for name in args.endpoint or ENDPOINTS:
+    compactor.compact(ENDPOINTS[name](), partitions=args.seasons, force=args.force)
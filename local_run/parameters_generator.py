@@ -1,57 +1,31 @@
 from src.extraction.extraction import Extractor
-from src.loading.loader import Loader
-from config import get_local_crendentials
+from local_run.pipeline.loading import get_loader
 from endpoints import *
 
+# Uma sessão HTTP e um Loader (sobre o pool compartilhado) para todos os endpoints estáticos
+EXTRACTOR = Extractor()
+LOADER = get_loader()
 
-def get_all_seasons_id():
-    config = get_all_seasons_id_endpoint()
-    creds = get_local_crendentials()
-    
+
+def extract_and_load(config: EndpointConfig):
     url = config.url
-    filename = config.filename
+    filename = config.resolve_filename()
     out_dir = config.output_dir
     
-    extractor = Extractor()
-    data_extracted = extractor.make_request(url)
-    extractor.save_json(data=data_extracted, output_dir=out_dir, filename=filename)
+    EXTRACTOR.extract_to_file(url=url, output_dir=out_dir, filename=filename, output_format=config.output_format)
     
-    loader = Loader(**creds)
-    
-    loader.load(config)
+    LOADER.load(config)
+
+
+def get_all_seasons_id():
+    extract_and_load(get_all_seasons_id_endpoint())
     
 
 def get_all_games_id():
-    config = get_all_games_summary_endpoint()
-    creds = get_local_crendentials()
-    
-    url = config.url
-    filename = config.filename
-    out_dir = config.output_dir
-    
-    extractor = Extractor()
-    data_extracted = extractor.make_request(url)
-    extractor.save_json(data=data_extracted, output_dir=out_dir, filename=filename)
-    
-    loader = Loader(**creds)
-    
-    loader.load(config)
+    extract_and_load(get_all_games_summary_endpoint())
 
 def get_all_teams_id():
-    config = get_all_teams_id_endpoint()
-    creds = get_local_crendentials()
-    
-    url = config.url
-    filename = config.filename
-    out_dir = config.output_dir
-    
-    extractor = Extractor()
-    data_extracted = extractor.make_request(url)
-    extractor.save_json(data=data_extracted, output_dir=out_dir, filename=filename)
-    
-    loader = Loader(**creds)
-    
-    loader.load(config)
+    extract_and_load(get_all_teams_id_endpoint())
 
 if __name__ == "__main__":
     # get_all_seasons_id()
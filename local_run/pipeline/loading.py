@@ -1,22 +1,31 @@
 from endpoints import *
-from config import get_local_crendentials
+from config import get_local_crendentials, get_pool_settings
+from src.db import PooledConnectionProvider, get_shared_engine
 from src.loading.loader import Loader
 
+# Pool de conexões do processo, compartilhado com a extração (mesma URL = mesmo engine)
+ENGINE = get_shared_engine(**get_local_crendentials(), **get_pool_settings())
+
+# As listagens de arquivos usam use_cache=True: diretórios sem mudança são lidos do
+# snapshot em <raw>/.scan_cache em vez de listados de novo (ver DirectoryScanner)
+
+def get_loader() -> Loader:
+  return Loader(connection_provider=PooledConnectionProvider(ENGINE))
+
 
 ###################################################################
 ## LOADING
 ###################################################################
 
-def all_games_details_loading(*, test_mode: bool = False):
+def all_games_details_loading(*, seasons: list[str] | None = None, test_mode: bool = False):
   """
   CONTEM DETALHES DO JOGO COM JOGADORES
+  - Se seasons for informado, carrega apenas essas partições (ex.: ['20242025']).
   """
   config = get_all_games_details_endpoint()
-  creds = get_local_crendentials()
-  
-  loader = Loader(**creds)
+  loader = get_loader()
   
-  files = list(config.output_dir.glob(config.file_pattern))
+  files = config.collect_files(partitions=seasons, use_cache=True)
 
   if test_mode:
       loader.logger.info("Running in TEST MODE")
@@ -24,16 +33,15 @@ def all_games_details_loading(*, test_mode: bool = False):
   
   loader.load_files(config, files)
 
-def all_games_summary_details_loading(*, test_mode: bool = False):
+def all_games_summary_details_loading(*, seasons: list[str] | None = None, test_mode: bool = False):
   """
   CONTEM DETALHES DO JOGO
+  - Se seasons for informado, carrega apenas essas partições (ex.: ['20242025']).
   """
   config = get_all_games_summary_details_endpoint()
-  creds = get_local_crendentials()
+  loader = get_loader()
   
-  loader = Loader(**creds)
-  
-  files = list(config.output_dir.glob(config.file_pattern))
+  files = config.collect_files(partitions=seasons, use_cache=True)
   
   if test_mode:
       loader.logger.info("Running in TEST MODE")
@@ -46,11 +54,9 @@ def all_club_stats_loading(*, test_mode: bool = False):
   CONTEM DETALHES DO JOGO
   """
   config = get_all_club_stats_endpoint()
-  creds = get_local_crendentials()
-  
-  loader = Loader(**creds)
+  loader = get_loader()
   
-  files = list(config.output_dir.glob(config.file_pattern))
+  files = config.collect_files(use_cache=True)
   
   if test_mode:
       loader.logger.info("Running in TEST MODE")
@@ -63,11 +69,9 @@ def all_players_loading(*, test_mode: bool = False):
   CONTEM DETALHES DO JOGO
   """
   config = get_all_players_endpoint()
-  creds = get_local_crendentials()
+  loader = get_loader()
   
-  loader = Loader(**creds)
-  
-  files = list(config.output_dir.glob(config.file_pattern))
+  files = config.collect_files(use_cache=True)
   
   if test_mode:
       loader.logger.info("Running in TEST MODE")
@@ -75,30 +79,39 @@ def all_players_loading(*, test_mode: bool = False):
 
   loader.load_files(config, files)
 
-def all_games_gamelog_loading(*, seasons: list[str] | None = None, test_mode: bool = False):
+def all_games_gamelog_loading(
+  *,
+  seasons: list[str] | None = None,
+  all_seasons: bool = False,
+  test_mode: bool = False,
+  workers: int = 4,
+):
   """
   CONTEM DETALHES DO JOGO
   - Se seasons for informado, carrega apenas essas pastas (ex.: ['20252026', '20242025']).
   - Se seasons for None, carrega a temporada mais recente (subpasta de maior nome).
+  - all_seasons=True recarrega todas as temporadas em paralelo, uma transação por temporada.
+  - Endpoint merge: os arquivos novos ou alterados vão num único COPY para a tabela temporária.
   """
   config = get_all_players_gamelog_endpoint()
-  creds = get_local_crendentials()
-  
-  loader = Loader(**creds)
-  
-  base_dir = config.output_dir
+  loader = get_loader()
 
-  if seasons:
-      season_dirs = [base_dir / str(s) for s in seasons]
-  else:
-      subdirs = [d for d in base_dir.iterdir() if d.is_dir()]
-      if not subdirs:
-          loader.logger.warning(f"No season folders found under {base_dir}")
+  if all_seasons and not test_mode:
+      loader.load_partitions(config, seasons, workers=workers)
+      return
+  
+  if not seasons:
+      partition_dirs = config.partition_dirs()
+      if not partition_dirs:
+          loader.logger.warning(f"No season folders found under {config.output_dir}")
           return
-      latest = max(subdirs, key=lambda p: p.name)
-      season_dirs = [latest]
+      seasons = [max(partition_dirs, key=lambda p: p.name).name]
+
+  if len(seasons) > 1 and not test_mode:
+      loader.load_partitions(config, seasons, workers=workers)
+      return
 
-  files = config.collect_files(season_dirs)
+  files = config.collect_files(partitions=seasons, use_cache=True)
   
   if test_mode:
       loader.logger.info("Running in TEST MODE")
@@ -106,22 +119,25 @@ def all_games_gamelog_loading(*, seasons: list[str] | None = None, test_mode: bo
 
   loader.load_files(config, files)
 
-def all_games_play_by_play_loading(*, test_mode: bool = False):
+def all_games_play_by_play_loading(*, seasons: list[str] | None = None, test_mode: bool = False, parallel: bool = False):
   """
   CONTEM DETALHES DO JOGO
+  - Se seasons for informado, carrega apenas essas partições (ex.: ['20242025']).
+  - parallel=True usa todos os cores para parsing e várias conexões para o COPY.
   """
   config = get_all_games_play_by_play_endpoint()
-  creds = get_local_crendentials()
+  loader = get_loader()
   
-  loader = Loader(**creds)
-  
-  files = list(config.output_dir.glob(config.file_pattern))
+  files = config.collect_files(partitions=seasons, use_cache=True)
   
   if test_mode:
       loader.logger.info("Running in TEST MODE")
       files = files[:3]
 
-  loader.load_files(config, files)
+  if parallel:
+      loader.load_files_parallel(config, files)
+  else:
+      loader.load_files(config, files)
 
 if __name__ == '__main__':
   all_games_summary_details_loading()
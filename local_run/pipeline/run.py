@@ -0,0 +1,55 @@
+"""
+Execução noturna completa: extração e carga de todos os endpoints como um DAG,
+carregando os arquivos no Postgres enquanto a extração ainda está rodando.
+
+    python -m local_run.pipeline.run
+    python -m local_run.pipeline.run --only gamelog play_by_play
+"""
+import argparse
+import logging
+
+from endpoints import *
+from src.pipeline import PipelineRunner, Step
+from local_run.pipeline.extracting import run_extraction
+from local_run.pipeline.loading import get_loader
+
+# Endpoint -> (factory, dependências)
+DAG = {
+  "seasons": (get_all_seasons_id_endpoint, ()),
+  "teams": (get_all_teams_id_endpoint, ()),
+  "games_summary": (get_all_games_summary_endpoint, ()),
+  "games_details": (get_all_games_details_endpoint, ("games_summary",)),
+  "games_summary_details": (get_all_games_summary_details_endpoint, ("games_summary",)),
+  "play_by_play": (get_all_games_play_by_play_endpoint, ("games_summary",)),
+  "club_stats": (get_all_club_stats_endpoint, ("seasons", "teams", "games_summary")),
+  "players": (get_all_players_endpoint, ("games_details",)),
+  "gamelog": (get_all_players_gamelog_endpoint, ("seasons", "games_details")),
+}
+
+
+def build_steps(*, max_workers: int = 8, from_lake: bool = False) -> list[Step]:
+  steps = []
+  for name, (factory, depends_on) in DAG.items():
+    config = factory()
+    extract = lambda on_saved, config=config: run_extraction(
+      config, max_workers=max_workers, from_lake=from_lake, on_saved=on_saved
+    )
+    steps.append(Step(name, config, extract, depends_on=depends_on))
+  return steps
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--only", nargs="+", help="steps a executar (com suas dependências)")
+  parser.add_argument("--max-workers", type=int, default=8)
+  parser.add_argument("--parallel-steps", type=int, default=3)
+  parser.add_argument("--from-lake", action="store_true", help="planeja as listas com DuckDB sobre o lake")
+  args = parser.parse_args()
+
+  logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+  runner = PipelineRunner(
+    get_loader(),
+    build_steps(max_workers=args.max_workers, from_lake=args.from_lake),
+    max_parallel_steps=args.parallel_steps,
+  )
+  runner.run(only=args.only)
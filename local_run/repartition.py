@@ -0,0 +1,36 @@
+"""
+Move os arquivos brutos ainda no layout plano (direto em output_dir) para as
+subpastas de partição definidas por `partition_by` no EndpointConfig.
+
+    python -m local_run.repartition --dry-run
+
+`os.replace` preserva tamanho e mtime, então o controle de ingestão
+(nhl_ingestion_control) continua reconhecendo os arquivos como já carregados;
+no manifesto de extração o registro do caminho antigo passa para o novo, para o
+`skip_existing`.
+"""
+import argparse
+import logging
+
+from endpoints import (
+    get_all_games_details_endpoint,
+    get_all_games_play_by_play_endpoint,
+    get_all_games_summary_details_endpoint,
+    get_all_players_gamelog_endpoint,
+)
+from src.repartition import repartition
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    for factory in (
+        get_all_games_details_endpoint,
+        get_all_games_summary_details_endpoint,
+        get_all_players_gamelog_endpoint,
+        get_all_games_play_by_play_endpoint,
+    ):
+        repartition(factory(), dry_run=args.dry_run)
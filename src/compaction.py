@@ -0,0 +1,158 @@
+from pathlib import Path
+from typing import Iterable, Optional
+import logging
+import os
+
+import duckdb
+
+from ..endpoints import EndpointConfig
+
+
+PARQUET_FILENAME = "data.parquet"
+
+
+def _sql_str(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class ParquetCompactor:
+    """Packs the raw JSON files of an endpoint into Parquet with DuckDB.
+
+    Each partition of a partitioned endpoint (see `EndpointConfig.partition_by`)
+    becomes one file, in hive layout so DuckDB/pandas/Spark read the partition
+    as a column::
+
+        <parquet_root>/<table_name>/<partition_by>=<partition>/data.parquet
+        <parquet_root>/<table_name>/data.parquet   # endpoints sem partição
+
+    Rows match the raw tables: `payload` (JSON, one per `array_key` item) and
+    `source_filename`. Files are written to a temp name and renamed, so readers
+    never see a partial Parquet file.
+    """
+
+    def __init__(
+        self,
+        parquet_root: Path,
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None,
+        row_group_size: int = 100_000,
+        compression: str = "zstd",
+    ):
+        self.parquet_root = Path(parquet_root)
+        self.threads = threads
+        self.memory_limit = memory_limit
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.logger = logging.getLogger(__name__)
+
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        con = duckdb.connect()
+        con.execute("SET preserve_insertion_order = false")
+        if self.threads:
+            con.execute(f"SET threads = {int(self.threads)}")
+        if self.memory_limit:
+            con.execute(f"SET memory_limit = {_sql_str(self.memory_limit)}")
+        return con
+
+    def target_dir(self, config: EndpointConfig) -> Path:
+        return self.parquet_root / config.table_name
+
+    def target_path(self, config: EndpointConfig, partition: Optional[str] = None) -> Path:
+        base = self.target_dir(config)
+        if partition is not None:
+            base = base / f"{config.partition_by}={partition}"
+        return base / PARQUET_FILENAME
+
+    @staticmethod
+    def _raw_files(config: EndpointConfig, partition: Optional[str]) -> list[Path]:
+        if partition is not None:
+            return config.collect_files(partitions=[partition])
+        if not config.filename_fields() and not config.file_pattern:
+            # endpoints estáticos dividem a mesma pasta: só o próprio arquivo
+            path = Path(config.output_dir) / config.resolve_filename()
+            return [path] if path.exists() else []
+        return config.collect_files()
+
+    def _select_sql(self, config: EndpointConfig, files: list[Path]) -> str:
+        file_list = "[" + ", ".join(_sql_str(p) for p in files) + "]"
+        source = (
+            f"read_json_objects({file_list}, format = 'auto', "
+            f"compression = 'auto_detect', filename = true)"
+        )
+        source_filename = r"regexp_extract(filename, '[^/\\]+$')"
+        if config.array_key:
+            key_path = _sql_str(f'$."{config.array_key}"')
+            payload = f"unnest(from_json(json_extract(json, {key_path}), '[\"JSON\"]'))"
+        else:
+            payload = "json"
+        return f"SELECT {payload} AS payload, {source_filename} AS source_filename FROM {source}"
+
+    def _is_current(self, con, target: Path, files: list[Path]) -> bool:
+        """The Parquet file is newer than every raw file and covers exactly the same files."""
+        try:
+            target_mtime = target.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if any(p.stat().st_mtime_ns > target_mtime for p in files):
+            return False
+        (count,) = con.execute(
+            f"SELECT count(DISTINCT source_filename) FROM read_parquet({_sql_str(target)})"
+        ).fetchone()
+        return count == len({p.name for p in files})
+
+    def _write(self, con, config: EndpointConfig, files: list[Path], target: Path) -> int:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.tmp")
+        try:
+            con.execute(
+                f"COPY ({self._select_sql(config, files)}) TO {_sql_str(tmp)} "
+                f"(FORMAT parquet, COMPRESSION {self.compression}, ROW_GROUP_SIZE {int(self.row_group_size)})"
+            )
+            (rows,) = con.execute(f"SELECT count(*) FROM read_parquet({_sql_str(tmp)})").fetchone()
+            os.replace(tmp, target)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return rows
+
+    def compact(
+        self,
+        config: EndpointConfig,
+        partitions: Optional[Iterable[str]] = None,
+        force: bool = False,
+    ) -> list[Path]:
+        """Writes (or refreshes) the Parquet files of an endpoint.
+
+        Args:
+            config (EndpointConfig): Endpoint whose raw files are compacted
+            partitions (Iterable[str] | None): Partitions to compact; all existing ones when None
+            force (bool): Rewrites partitions even when their Parquet file is up to date
+
+        Returns:
+            list[Path]: Parquet files written in this call
+        """
+        if config.partition_by is None:
+            units: list[Optional[str]] = [None]
+        elif partitions is None:
+            units = [d.name for d in config.partition_dirs()]
+        else:
+            units = [str(p) for p in partitions]
+
+        written: list[Path] = []
+        con = self._connect()
+        try:
+            for partition in units:
+                files = self._raw_files(config, partition)
+                target = self.target_path(config, partition)
+                if not files:
+                    self.logger.warning(f"No raw files for {config.table_name} partition {partition}")
+                    continue
+                if not force and self._is_current(con, target, files):
+                    self.logger.info(f"Parquet up to date: {target}")
+                    continue
+                rows = self._write(con, config, files, target)
+                written.append(target)
+                self.logger.info(f"Compacted {len(files)} file(s) into {target} ({rows} rows)")
+        finally:
+            con.close()
+        return written
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+import gzip
+
+
+# Sufixo acrescentado ao nome do arquivo .json para cada formato de saída
+OUTPUT_FORMAT_SUFFIXES = {
+    "json": "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("output_format='zstd' requires the 'zstandard' package (pip install 'nhl[zstd]')") from e
+    return zstandard
+
+
+def suffix_for(output_format: str) -> str:
+    try:
+        return OUTPUT_FORMAT_SUFFIXES[output_format]
+    except KeyError:
+        raise ValueError(
+            f"Unknown output_format '{output_format}'. "
+            f"Expected one of: {', '.join(OUTPUT_FORMAT_SUFFIXES)}"
+        )
+
+
+def format_for(path: Path) -> str:
+    """Infers the output format of a raw file from its suffix."""
+    suffix = Path(path).suffix
+    for output_format, format_suffix in OUTPUT_FORMAT_SUFFIXES.items():
+        if format_suffix and suffix == format_suffix:
+            return output_format
+    return "json"
+
+
+@contextmanager
+def compressing_writer(fileobj: BinaryIO, output_format: str) -> Iterator[BinaryIO]:
+    """Wraps an open binary file so writes are compressed; `fileobj` is left open."""
+    if output_format == "json":
+        yield fileobj
+    elif output_format == "gzip":
+        with gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6) as writer:
+            yield writer
+    elif output_format == "zstd":
+        with _zstandard().ZstdCompressor().stream_writer(fileobj, closefd=False) as writer:
+            yield writer
+    else:
+        suffix_for(output_format)  # levanta ValueError
+        yield fileobj
+
+
+def open_read(path: Path) -> BinaryIO:
+    """Opens a raw file for binary reading, decompressing by suffix."""
+    output_format = format_for(path)
+    if output_format == "gzip":
+        return gzip.open(path, "rb")
+    if output_format == "zstd":
+        return _zstandard().open(path, "rb")
+    return Path(path).open("rb")
+
+
+def read_bytes(path: Path) -> bytes:
+    with open_read(path) as f:
+        return f.read()
@@ -0,0 +1,84 @@
+from typing import Callable, Optional
+import logging
+import threading
+
+import sqlalchemy
+from psycopg2.extensions import connection as PGConn
+
+
+logger = logging.getLogger(__name__)
+
+_engines: dict[tuple, sqlalchemy.engine.Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def engine_url(host: str, port, dbname: str, user: str, password: str) -> sqlalchemy.engine.URL:
+    return sqlalchemy.engine.URL.create(
+        "postgresql+psycopg2",
+        username=user,
+        password=password,
+        host=host,
+        port=int(port) if port else None,
+        database=dbname,
+    )
+
+
+def get_shared_engine(
+    host: str = None,
+    port=None,
+    dbname: str = None,
+    user: str = None,
+    password: str = None,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30.0,
+    pool_recycle: int = 1800,
+) -> sqlalchemy.engine.Engine:
+    """Process-wide pooled engine, one per database URL and pool settings.
+
+    `pool_pre_ping` checks each connection on checkout and replaces it if the
+    server dropped it; `pool_recycle` renews connections older than that
+    many seconds. `create_engine` does not connect, so this is cheap to call.
+    """
+    url = engine_url(host, port, dbname, user, password)
+    key = (url.render_as_string(hide_password=False), pool_size, max_overflow, pool_timeout, pool_recycle)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = sqlalchemy.create_engine(
+                url,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=True,
+            )
+            _engines[key] = engine
+            logger.info(f"Connection pool created for {url.render_as_string()} (size={pool_size}, overflow={max_overflow})")
+        return engine
+
+
+class PooledConnectionProvider:
+    """`connection_provider` backed by an engine's pool, for `Loader` and `get_data_from_db`.
+
+    Calling it checks out a psycopg2 connection (health-checked by
+    `pool_pre_ping`); `release` returns it to the pool instead of closing
+    the socket. Sharing the engine with `get_data_from_db(engine=...)` keeps
+    a single pool per process.
+    """
+
+    def __init__(self, engine: sqlalchemy.engine.Engine):
+        self.engine = engine
+
+    def __call__(self) -> PGConn:
+        return self.engine.raw_connection()
+
+    def release(self, conn: PGConn):
+        conn.close()  # conexão do pool: close() devolve ao pool
+
+
+def release_connection(provider: Optional[Callable[[], PGConn]], conn: PGConn):
+    """Returns `conn` to `provider` when it is a pool; other providers own their connections."""
+    release = getattr(provider, "release", None)
+    if release is not None:
+        release(conn)
@@ -0,0 +1,163 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable, Optional, Sequence
+import logging
+
+from ...endpoints import EndpointConfig
+from .extraction import Extractor, FetchResult
+from .manifest import ExtractionManifest
+
+
+class ConcurrentExtractor:
+    """Fans out the requests of one endpoint over a bounded thread pool.
+
+    `requests` is blocking, so concurrency comes from threads sharing a single
+    `Extractor` (and its session). At most `max_workers` requests are in flight
+    and the parameter iterable is consumed lazily, so generators are fine.
+    Overwrite endpoints are requested conditionally when the extractor has an
+    `http_cache`. Every saved file is recorded in the endpoint's
+    `ExtractionManifest`, which `skip_existing` uses to resume interrupted runs.
+    """
+
+    def __init__(
+        self,
+        extractor: Optional[Extractor] = None,
+        max_workers: int = 8,
+        log_every: int = 500,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self.extractor = extractor or Extractor()
+        self.max_workers = max_workers
+        self.log_every = log_every
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _as_params(row: Any, cols: Sequence[str]) -> dict:
+        values = row if isinstance(row, (tuple, list)) else (row,)
+        if len(values) != len(cols):
+            raise ValueError(f"Expected {len(cols)} values for {list(cols)}, got {values!r}")
+        return dict(zip(cols, values))
+
+    @staticmethod
+    def _target(
+        config: EndpointConfig,
+        params: dict,
+        output_dir_fn: Optional[Callable[[dict], Path]],
+    ) -> Path:
+        output_dir = output_dir_fn(params) if output_dir_fn else config.resolve_output_dir(**params)
+        return Path(output_dir) / config.resolve_filename(**params)
+
+    def _extract_one(
+        self,
+        config: EndpointConfig,
+        params: dict,
+        target: Path,
+        manifest: ExtractionManifest,
+    ) -> FetchResult:
+        result = self.extractor.fetch_to_file(
+            url=config.url.format(**params),
+            output_dir=target.parent,
+            filename=target.name,
+            conditional=config.is_overwrite,
+            output_format=config.output_format,
+        )
+        if result.path is not None:
+            manifest.record(result.path, result.content_hash)
+        return result
+
+    def run(
+        self,
+        config: EndpointConfig,
+        rows: Iterable[Any],
+        cols: Sequence[str],
+        output_dir_fn: Optional[Callable[[dict], Path]] = None,
+        skip_existing: bool = False,
+        on_saved: Optional[Callable[[Path], None]] = None,
+        on_result: Optional[Callable[[Any, FetchResult], None]] = None,
+    ) -> list[Path]:
+        """Extracts every row of parameters and saves each result as it completes.
+
+        Args:
+            config (EndpointConfig): Endpoint whose `url`/`filename` templates are formatted
+            rows (Iterable[Any]): Scalars (single column) or tuples in the order of `cols`
+            cols (Sequence[str]): Template field names for each value of a row
+            output_dir_fn (Callable | None): Overrides `config.resolve_output_dir` (partitioning) per row
+            skip_existing (bool): Skips rows whose file is already in the manifest
+            on_saved (Callable | None): Called with each file written as soon as it completes,
+                e.g. to feed a loader while extraction is still running; files kept
+                unchanged (304 or same body) are not reported
+            on_result (Callable | None): Called with every row and its `FetchResult`, which
+                tells missing data (`path` None) apart from failures (`error` set);
+                rows skipped by `skip_existing` report their existing file
+
+        Returns:
+            list[Path]: Files written, in completion order
+        """
+        manifest = ExtractionManifest(config.output_dir)
+        existing = manifest.relpaths() if skip_existing else set()
+        saved: list[Path] = []
+        skipped_count = 0
+        done_count = 0
+        empty_count = 0
+        failed_count = 0
+        start = perf_counter()
+        max_pending = self.max_workers * 2
+        pending: dict[Future, Any] = {}
+
+        def collect(futures: set[Future]):
+            nonlocal done_count, empty_count, failed_count
+            for future in futures:
+                row = pending.pop(future)
+                done_count += 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.exception("Extraction task failed")
+                    result = FetchResult(None, error=f"{type(e).__name__}: {e}")
+                path = result.path
+                if result.error is not None:
+                    failed_count += 1
+                elif path is None:
+                    empty_count += 1
+                elif result.changed:
+                    saved.append(path)
+                    if on_saved is not None:
+                        on_saved(path)
+                if on_result is not None:
+                    on_result(row, result)
+                if self.log_every and done_count % self.log_every == 0:
+                    elapsed = perf_counter() - start
+                    self.logger.info(
+                        f"Extração: {done_count} requests em {elapsed:.1f}s "
+                        f"({done_count / elapsed:.1f} req/s)"
+                    )
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for row in rows:
+                    params = self._as_params(row, cols)
+                    target = self._target(config, params, output_dir_fn)
+                    if existing and manifest.relpath(target) in existing:
+                        skipped_count += 1
+                        if on_result is not None:
+                            on_result(row, FetchResult(target))
+                        continue
+                    pending[pool.submit(self._extract_one, config, params, target, manifest)] = row
+                    if len(pending) >= max_pending:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(finished)
+                finished, _ = wait(pending)
+                collect(finished)
+        finally:
+            manifest.close()
+
+        elapsed = perf_counter() - start
+        rate = done_count / elapsed if elapsed else 0.0
+        self.logger.info(
+            f"Completed {done_count} requests ({empty_count} without data, {failed_count} failed, "
+            f"{skipped_count} skipped as already extracted) "
+            f"in {elapsed:.2f}s ({rate:.1f} req/s) for {config.table_name}"
+        )
+        return saved
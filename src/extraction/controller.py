@@ -1,31 +1,107 @@
+import csv
 import pandas as pd
 import sqlalchemy
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import Any, Iterator, List, Optional, Callable
 from psycopg2.extensions import connection as PGConn
+from ..db import release_connection
+
+
+RETURN_TYPES = ("list", "tuples", "df", "iter")
+
+
+def _build_query(table: str, cols: List[str], schema: str, bool_filter: Optional[tuple[str, bool]], distinct: bool = False) -> str:
+    columns_sql = ", ".join(cols)
+    sql = f"SELECT {'DISTINCT ' if distinct else ''}{columns_sql} FROM {schema}.{table}"
+
+    if bool_filter:
+        col, value = bool_filter
+        sql += f" WHERE {col} IS {'TRUE' if value else 'FALSE'}"
+    return sql
+
+
+def iter_data_from_db(
+    table: str,
+    cols: List[str],
+    schema: str = "staging",
+    output_csv: Optional[Path] = None,
+    bool_filter: Optional[tuple[str, bool]] = None,
+    connection_provider: Optional[Callable[[], PGConn]] = None,
+    engine: Optional[sqlalchemy.engine] = None,
+    chunk_size: int = 10_000,
+) -> Iterator[Any]:
+    """Streams distinct rows through a server-side cursor, `chunk_size` rows per round trip.
+
+    Yields scalars for a single column and tuples otherwise, so it can feed
+    `ConcurrentExtractor.run` directly. Deduplication runs in the database
+    (`SELECT DISTINCT`) and `output_csv` is written as rows are consumed, so
+    memory does not grow with the size of the work list.
+    """
+    if not connection_provider and not engine:
+        raise ValueError("Deve fornecer 'connection_provider' ou 'engine'")
+
+    sql = _build_query(table, cols, schema, bool_filter, distinct=True)
+    single = len(cols) == 1
+
+    def rows() -> Iterator[tuple]:
+        if connection_provider:
+            # cursor nomeado = cursor no servidor (psycopg2); a conexão é de quem forneceu
+            conn = connection_provider()
+            try:
+                with conn.cursor(name=f"iter_{table}") as cur:
+                    cur.itersize = chunk_size
+                    cur.execute(sql)
+                    yield from cur
+            finally:
+                release_connection(connection_provider, conn)
+        else:
+            with engine.connect() as conn:
+                result = conn.execution_options(yield_per=chunk_size).execute(sqlalchemy.text(sql))
+                for partition in result.partitions():
+                    yield from (tuple(row) for row in partition)
+
+    csv_file = None
+    try:
+        if output_csv:
+            output_csv = Path(output_csv)
+            output_csv.parent.mkdir(parents=True, exist_ok=True)
+            csv_file = output_csv.open("w", newline="", encoding="utf-8")
+            writer = csv.writer(csv_file)
+            writer.writerow(cols)
+        for row in rows():
+            if csv_file:
+                writer.writerow(row)
+            yield row[0] if single else row
+    finally:
+        if csv_file:
+            csv_file.close()
+
 
 def get_data_from_db(
     table: str,
     cols: List[str],
     schema: str = "staging",
     output_csv: Optional[Path] = None,
-    return_as: str = "list",  # "list", "tuples", "df"
+    return_as: str = "list",  # "list", "tuples", "df", "iter" (streaming, ver iter_data_from_db)
     bool_filter: Optional[tuple[str, bool]] = None,  # ("is_fully_synced", True)
     connection_provider: Optional[Callable[[], PGConn]] = None,
     engine: Optional[sqlalchemy.engine] = None,
+    chunk_size: int = 10_000,
 ):
 
     if not connection_provider and not engine:
         raise ValueError("Deve fornecer 'connection_provider' ou 'engine'")
+    if return_as not in RETURN_TYPES:
+        raise ValueError("return_as must be: 'list', 'tuples', 'df' or 'iter'")
+
+    if return_as == "iter":
+        return iter_data_from_db(
+            table, cols, schema, output_csv, bool_filter, connection_provider, engine, chunk_size
+        )
     # -----------------------------
     # Monta query
     # -----------------------------
-    columns_sql = ", ".join(cols)
-    sql = f"SELECT {columns_sql} FROM {schema}.{table}"
-
-    if bool_filter:
-        col, value = bool_filter
-        sql += f" WHERE {col} IS {'TRUE' if value else 'FALSE'}"
+    sql = _build_query(table, cols, schema, bool_filter)
 
     # -----------------------------
     # Executa query
@@ -33,8 +109,11 @@ def get_data_from_db(
     if connection_provider:
         # Usa connection_provider (psycopg2)
         conn = connection_provider()
-        df = pd.read_sql(sql, con=conn)
-        # Nota: não fechamos a conexão aqui, quem forneceu é responsável
+        try:
+            df = pd.read_sql(sql, con=conn)
+        finally:
+            # Pool (PooledConnectionProvider): devolve a conexão; outros providers são responsáveis por ela
+            release_connection(connection_provider, conn)
     else:
         # Usa engine (SQLAlchemy)
         df = pd.read_sql(sql, con=engine)
@@ -60,7 +139,5 @@ def get_data_from_db(
             raise ValueError("list return requires exactly one column")
         return df[cols[0]].to_list()
 
-    if return_as == "tuples":
-        return list(df.itertuples(index=False, name=None))
-
-    raise ValueError("return_as must be: 'list', 'tuples', or 'df'")
+    # "tuples" (return_as já validado no início)
+    return list(df.itertuples(index=False, name=None))
@@ -0,0 +1,174 @@
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+import logging
+
+import sqlalchemy
+from psycopg2.extensions import connection as PGConn
+
+from ...endpoints import EndpointConfig
+from .concurrent import ConcurrentExtractor
+from .controller import get_data_from_db
+from .extraction import Extractor, FetchResult
+from .work_queue import WorkItem, WorkQueue
+
+
+class EndpointExecutor:
+    """Runs any `EndpointConfig` from its declaration.
+
+    Dynamic endpoints read their parameters from `config.params_source`
+    (streamed, see `iter_data_from_db`) and are fanned out by a
+    `ConcurrentExtractor`; files land in `config.resolve_output_dir`, so
+    partitioning follows `partition_by`. Static endpoints (no template
+    fields) are a single conditional request. Every run shares the same
+    `Extractor` (HTTP session, rate limiter, HTTP cache) and the same
+    database engine or connection provider.
+
+    With a `work_queue`, dynamic endpoints are resumable: the work list is
+    stored in the queue once per run and requests are leased from it, so a
+    restarted (or second, concurrent) process continues where the run
+    stopped instead of planning again. Each queue is keyed by the endpoint
+    and its `params_source`; explicit `rows` bypass the queue.
+    """
+
+    def __init__(
+        self,
+        extractor: Optional[Extractor] = None,
+        engine: Optional[sqlalchemy.engine.Engine] = None,
+        connection_provider: Optional[Callable[[], PGConn]] = None,
+        from_lake: bool = False,
+        max_workers: int = 8,
+        chunk_size: int = 10_000,
+        work_queue: Optional[WorkQueue] = None,
+    ):
+        if not from_lake and not engine and not connection_provider:
+            raise ValueError("Deve fornecer 'engine', 'connection_provider' ou from_lake=True")
+        self.extractor = extractor or Extractor()
+        self.engine = engine
+        self.connection_provider = connection_provider
+        self.from_lake = from_lake
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.work_queue = work_queue
+        self.logger = logging.getLogger(__name__)
+
+    def work_list(self, config: EndpointConfig) -> Iterable[Any]:
+        """Lazy parameter rows of a dynamic endpoint, in `params_source.cols` order."""
+        source = config.params_source
+        if source is None:
+            raise ValueError(f"{config.table_name} has no params_source")
+        kwargs = {
+            "table": source.view,
+            "cols": list(source.cols),
+            "bool_filter": source.bool_filter,
+            "return_as": "iter",
+            "chunk_size": self.chunk_size,
+        }
+        if self.from_lake:
+            from .lake import get_data_from_lake  # duckdb só quando usado
+            return get_data_from_lake(**kwargs)
+        return get_data_from_db(
+            schema=source.schema,
+            engine=self.engine,
+            connection_provider=self.connection_provider,
+            **kwargs,
+        )
+
+    def queue_name(self, config: EndpointConfig) -> str:
+        """Work queue of a dynamic endpoint: one per endpoint and parameter source."""
+        source = config.params_source
+        if source is None:
+            raise ValueError(f"{config.table_name} has no params_source")
+        name = f"{config.table_name}:{source.schema}.{source.view}"
+        if source.bool_filter is not None:
+            column, value = source.bool_filter
+            name += f"[{column}={value}]"
+        return name
+
+    def run(
+        self,
+        config: EndpointConfig,
+        rows: Optional[Iterable[Any]] = None,
+        max_workers: Optional[int] = None,
+        skip_existing: bool = False,
+        on_saved: Optional[Callable[[Path], None]] = None,
+    ) -> list[Path]:
+        """Extracts one endpoint.
+
+        Args:
+            config (EndpointConfig): Endpoint to run
+            rows (Iterable | None): Parameter rows; defaults to `work_list(config)`.
+                Explicit rows are extracted directly, without the work queue
+            max_workers (int | None): Concurrent requests; defaults to the executor's
+            skip_existing (bool): Skips files already in the extraction manifest
+            on_saved (Callable | None): Called with each file written (see `ConcurrentExtractor.run`)
+
+        Returns:
+            list[Path]: Files written; unchanged files (304 or same body) are left out
+
+        Raises:
+            RuntimeError: If the request of a static endpoint failed, so the file was not refreshed
+        """
+        if not config.filename_fields():
+            result = self.extractor.fetch_to_file(
+                url=config.url,
+                output_dir=config.output_dir,
+                filename=config.resolve_filename(),
+                conditional=config.is_overwrite,
+                output_format=config.output_format,
+            )
+            if result.error is not None:
+                raise RuntimeError(f"{config.table_name}: request to {config.url} failed ({result.error})")
+            if not result.changed:
+                return []
+            if on_saved is not None:
+                on_saved(result.path)
+            return [result.path]
+
+        cols = config.params_source.cols if config.params_source else config.filename_fields()
+        extractor = ConcurrentExtractor(self.extractor, max_workers=max_workers or self.max_workers)
+        if self.work_queue is not None and rows is None:
+            return self._run_queued(config, extractor, cols, skip_existing, on_saved)
+        if rows is None:
+            rows = self.work_list(config)
+        return extractor.run(config, rows, cols=cols, skip_existing=skip_existing, on_saved=on_saved)
+
+    def _run_queued(
+        self,
+        config: EndpointConfig,
+        extractor: ConcurrentExtractor,
+        cols: tuple[str, ...],
+        skip_existing: bool,
+        on_saved: Optional[Callable[[Path], None]],
+    ) -> list[Path]:
+        queue = self.queue_name(config)
+        self.work_queue.populate(
+            queue,
+            lambda: (ConcurrentExtractor._as_params(row, cols) for row in self.work_list(config)),
+        )
+
+        leased: dict[tuple, WorkItem] = {}
+
+        def leased_rows() -> Iterable[tuple]:
+            for item in self.work_queue.consume(queue, batch_size=extractor.max_workers * 2):
+                row = tuple(item.params[c] for c in cols)
+                leased[row] = item
+                yield row
+
+        def on_result(row: tuple, result: FetchResult):
+            item = leased.pop(row)
+            # sem dados (404, corpo vazio) é resultado final; só erros voltam para a fila
+            if result.error is not None:
+                self.work_queue.fail(item, result.error)
+            else:
+                self.work_queue.complete(item)
+
+        saved = extractor.run(
+            config,
+            leased_rows(),
+            cols=cols,
+            skip_existing=skip_existing,
+            on_saved=on_saved,
+            on_result=on_result,
+        )
+        self.logger.info(f"Queue {queue}: {self.work_queue.counts(queue)}")
+        return saved
@@ -1,48 +1,105 @@
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, NamedTuple, Optional
+import hashlib
 import json
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+import os
+import tempfile
 import logging
 
+from ..compression import compressing_writer
+from .http_cache import HttpCache
+from .rate_limit import RateLimiter, parse_retry_after
+from .transport import THROTTLE_STATUSES, RequestsTransport, Transport, TransportResponse
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _current_umask() -> int:
+    # os.umask só permite ler trocando o valor; lido uma vez, na importação
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+FILE_MODE = 0o666 & ~_current_umask()  # modo de um arquivo criado com open()
+
+
+class FetchResult(NamedTuple):
+    """Outcome of `Extractor.fetch_to_file`.
+
+    `path` is None when there was no file: either the API has no data for
+    the request (404 and other 4xx, empty body) or the request failed, in
+    which case `error` says why (network error, 5xx or throttled after the
+    retries, non-JSON body) and retrying later may succeed. `changed` is
+    False when the existing file was kept (304 or same body hash).
+    `content_hash` is the sha256 of the body, None if unknown (a 304 for a
+    file cached before hashes were stored).
+    """
+    path: Path | None
+    content_hash: str | None = None
+    changed: bool = False
+    error: str | None = None
 
 
 class Extractor:
-    def __init__(self):
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_throttle_retries: int = 5,
+        http_cache: Optional[HttpCache] = None,
+        transport: Optional[Transport] = None,
+    ):
         logging.basicConfig(
             level=logging.INFO,
             format="%(asctime)s - %(levelname)s - %(message)s",
         )
         self.logger = logging.getLogger()
-        self.session = self._configure_session()
-        
+        self.rate_limiter = rate_limiter
+        self.max_throttle_retries = max_throttle_retries
+        self.http_cache = http_cache
+        # Com rate limiter, 403/429 são tratados por ele (Retry-After + AIMD)
+        self.transport = transport or RequestsTransport(retry_throttled=rate_limiter is None)
+        self._errors = (*self.transport.errors, ValueError)
 
-    def _configure_session(self) -> requests.Session:
-        retry = Retry(
-            total=3,
-            status_forcelist=[403, 429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-            backoff_factor=0.5,
-            raise_on_status=False,
-        )
+    def _get(
+        self,
+        url: str,
+        timeout: int,
+        headers: Optional[dict] = None,
+        stream: bool = False,
+    ) -> TransportResponse:
+        """GET through the rate limiter, retrying throttled responses.
 
-        adapter = HTTPAdapter(max_retries=retry)
+        Every attempt, including the last one, is reported to the limiter:
+        2xx/304 raise the rate, 403/429 lower it; other statuses (5xx, 404)
+        leave it as is.
+        """
+        if self.rate_limiter is None:
+            return self.transport.get(url, timeout=timeout, headers=headers, stream=stream)
 
-        session = requests.Session()
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-
-        return session
+        for attempt in range(self.max_throttle_retries + 1):
+            self.rate_limiter.acquire(url)
+            response = self.transport.get(url, timeout=timeout, headers=headers, stream=stream)
+            if response.status_code in THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self.rate_limiter.on_throttle(url, retry_after)
+                if attempt == self.max_throttle_retries:
+                    return response
+                response.close()
+                continue
+            if 200 <= response.status_code < 300 or response.status_code == 304:
+                self.rate_limiter.on_success(url)
+            return response
 
     def make_request(self, url: str, timeout: int = 10) -> Any | None:
         self.logger.info("Making request...")
         try:
-            response = self.session.get(url, timeout=timeout)
+            response = self._get(url, timeout=timeout)
             self.logger.info(f"Status code: {response.status_code} OK")
             return response.json() if response.status_code in (200, 201) else None
 
-        except requests.exceptions.RequestException as e:
+        except self._errors as e:
             self.logger.error(
                 "Request failed",
                 extra={"url": url, "error": str(e)},
@@ -50,6 +107,142 @@ class Extractor:
             )
             return None
 
+    def extract_to_file(
+        self,
+        url: str,
+        output_dir: Path,
+        filename: str,
+        conditional: bool = False,
+        output_format: str = "json",
+        timeout: int = 10,
+    ) -> Path | None:
+        """Streams the response of `url` to disk; see `fetch_to_file`.
+
+        Returns:
+            Path | None: Path of the (possibly unchanged) file, None if no data
+        """
+        return self.fetch_to_file(url, output_dir, filename, conditional, output_format, timeout).path
+
+    def fetch_to_file(
+        self,
+        url: str,
+        output_dir: Path,
+        filename: str,
+        conditional: bool = False,
+        output_format: str = "json",
+        timeout: int = 10,
+    ) -> FetchResult:
+        """Streams the response of `url` to disk, skipping unchanged payloads.
+
+        The body is never parsed: chunks from `iter_content` are hashed and written
+        (compressed according to `output_format`) to a temporary file in
+        `output_dir`, which is atomically renamed over `filename` once complete.
+        Only the first byte is sniffed to look like JSON. `filename` must already
+        carry the compression suffix (see `EndpointConfig.resolve_filename`).
+
+        With `conditional=True` and an `http_cache`, stored validators are sent as
+        If-None-Match/If-Modified-Since. On 304, or on 200 with the same body hash
+        as the previous run, the existing file is kept untouched.
+
+        Returns:
+            FetchResult: Path of the (possibly unchanged) file, body hash and whether it was rewritten
+        """
+        output_dir = Path(output_dir)
+        filepath = output_dir / filename
+        use_cache = conditional and self.http_cache is not None
+        entry = self.http_cache.get(url) if use_cache and filepath.exists() else None
+
+        self.logger.info("Making request...")
+        try:
+            response = self._get(
+                url,
+                timeout=timeout,
+                headers=HttpCache.conditional_headers(entry),
+                stream=True,
+            )
+            with response:
+                self.logger.info(f"Status code: {response.status_code} OK")
+
+                if response.status_code == 304 and entry is not None:
+                    self.logger.info(f"Not modified, keeping: {filepath}")
+                    return FetchResult(filepath, entry.content_hash)
+
+                if response.status_code not in (200, 201):
+                    transient = response.status_code >= 500 or response.status_code in THROTTLE_STATUSES
+                    return FetchResult(None, error=f"HTTP {response.status_code}" if transient else None)
+
+                tmp_path, content_hash = self._stream_to_temp(
+                    response.iter_content(chunk_size=CHUNK_SIZE), output_dir, filename, output_format
+                )
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+        except self._errors as e:
+            self.logger.error(
+                "Request failed",
+                extra={"url": url, "error": str(e)},
+                exc_info=True,
+            )
+            return FetchResult(None, error=f"{type(e).__name__}: {e}")
+
+        if tmp_path is None:
+            self.logger.warning("No data in response to save. Returning None")
+            return FetchResult(None)
+
+        if use_cache:
+            self.http_cache.store(url, etag=etag, last_modified=last_modified, content_hash=content_hash)
+        if entry is not None and entry.content_hash == content_hash:
+            tmp_path.unlink()
+            self.logger.info(f"Unchanged content, keeping: {filepath}")
+            return FetchResult(filepath, content_hash)
+
+        os.replace(tmp_path, filepath)
+        self.logger.info(f"Extraction complete! Data saved on: {filepath}")
+        return FetchResult(filepath, content_hash, changed=True)
+
+    @staticmethod
+    def _stream_to_temp(
+        chunks: Iterable[bytes],
+        output_dir: Path,
+        filename: str,
+        output_format: str,
+    ) -> tuple[Path | None, str]:
+        """Writes chunks to a hidden temp file next to `filename`.
+
+        Returns the temp path (None if the body was empty) and the sha256 of the
+        uncompressed body. The body is not parsed; its first non-blank byte is
+        only sniffed for `{` or `[` to reject HTML error pages. `mkstemp` creates
+        the file as 0600, so it gets the umask-based mode of a regular file before
+        being renamed into place. The temp file is removed on any error.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        sniffed = False
+        fd, tmp_name = tempfile.mkstemp(dir=output_dir, prefix=f".{filename}.", suffix=".tmp")
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as f, compressing_writer(f, output_format) as writer:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if not sniffed and (head := chunk.lstrip()[:1]):
+                        if head not in (b"{", b"["):
+                            raise ValueError(f"Response body does not look like JSON: {chunk[:80]!r}")
+                        sniffed = True
+                    digest.update(chunk)
+                    writer.write(chunk)
+                    size += len(chunk)
+            os.chmod(tmp_path, FILE_MODE)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        if size == 0:
+            tmp_path.unlink()
+            return None, digest.hexdigest()
+        return tmp_path, digest.hexdigest()
+
     @staticmethod
     def save_json(data: Any | None, output_dir: Path, filename: str) -> Path | None:
         logger = logging.getLogger(__name__)
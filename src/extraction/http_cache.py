@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import sqlite3
+import threading
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+
+
+class HttpCache:
+    """SQLite index of HTTP validators (ETag, Last-Modified, body hash) per URL.
+
+    The database is opened lazily and shared between threads behind a lock.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_validators (
+                    url           TEXT PRIMARY KEY,
+                    etag          TEXT,
+                    last_modified TEXT,
+                    content_hash  TEXT,
+                    updated_at    TEXT NOT NULL
+                )
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, url: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT url, etag, last_modified, content_hash FROM http_validators WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry | None) -> dict[str, str]:
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_hash: Optional[str],
+    ):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """
+                INSERT INTO http_validators (url, etag, last_modified, content_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    updated_at = excluded.updated_at
+                """,
+                (url, etag, last_modified, content_hash, datetime.now(timezone.utc).isoformat()),
+            )
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
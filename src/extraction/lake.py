@@ -0,0 +1,222 @@
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+import logging
+
+import duckdb
+
+from ...endpoints import (
+    EndpointConfig,
+    get_all_games_details_endpoint,
+    get_all_games_play_by_play_endpoint,
+    get_all_games_summary_details_endpoint,
+    get_all_games_summary_endpoint,
+)
+
+
+# Tipos de jogo com club-stats/game-log: temporada regular e playoffs
+GAME_TYPES = (2, 3)
+# gameStateId de jogos encerrados na API de stats (api.nhle.com/stats/rest/en/game)
+FINAL_GAME_STATE = 7
+
+
+def _sql_str(value) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class LakeCatalog:
+    """DuckDB views over the raw lake with the same names and columns as the
+    Postgres request views, so work lists can be planned without a database.
+
+    - `vw_stg_request_games_id`: finished games of `all_games_summary.json`
+      with `has_games_details`/`has_games_summary_details`/`has_play_by_play`
+      flags computed from the files already in each endpoint's `output_dir`.
+    - `vw_stg_request_teams_seasons_gametypes_id`: teams that played each
+      season and game type.
+    - `vw_stg_request_players_id` and `vw_stg_request_players_seasons_gametypes_id`:
+      players found in the extracted boxscores (game details).
+
+    Views are lazy, so only the ones queried read their files.
+    """
+
+    def __init__(self, con: Optional[duckdb.DuckDBPyConnection] = None):
+        self.con = con or duckdb.connect()
+        self.logger = logging.getLogger(__name__)
+        self._create_views()
+
+    @staticmethod
+    def _files_sql(config: EndpointConfig) -> str:
+        """Files of an endpoint (any partition, any output format) with their template fields."""
+        pattern = Path(config.output_dir) / "**" / f"{config.file_pattern or '*'}*"
+        fields = ", ".join(
+            f"nullif(regexp_extract(name, {_sql_str(config.filename_regex())}, {i}), '') AS {field}"
+            for i, field in enumerate(config.filename_fields(), start=1)
+        )
+        return (
+            f"SELECT file, {fields} FROM ("
+            f"SELECT file, regexp_extract(file, '[^/\\\\]+$') AS name FROM glob({_sql_str(pattern)})"
+            f") WHERE regexp_matches(name, {_sql_str(config.filename_regex())})"
+        )
+
+    def _create_views(self):
+        summary = get_all_games_summary_endpoint()
+        summary_file = Path(summary.output_dir) / summary.resolve_filename()
+        details = get_all_games_details_endpoint()
+        extracted = {
+            "has_games_details": details,
+            "has_games_summary_details": get_all_games_summary_details_endpoint(),
+            "has_play_by_play": get_all_games_play_by_play_endpoint(),
+        }
+
+        self.con.execute(
+            f"""
+            CREATE OR REPLACE VIEW lake_games AS
+            SELECT g.id AS game_id, g.season AS season_id, g.gameType AS game_type_id,
+                   g.homeTeamId AS home_team_id, g.visitingTeamId AS visiting_team_id
+            FROM (
+                SELECT unnest(data) AS g
+                FROM read_json({_sql_str(summary_file)}, maximum_object_size = 1073741824)
+            )
+            WHERE g.gameStateId = {FINAL_GAME_STATE}
+            """
+        )
+
+        flags = ",\n".join(
+            f"EXISTS (SELECT 1 FROM ({self._files_sql(config)}) f "
+            f"WHERE f.game_id = CAST(g.game_id AS TEXT)) AS {flag}"
+            for flag, config in extracted.items()
+        )
+        self.con.execute(
+            f"""
+            CREATE OR REPLACE VIEW vw_stg_request_games_id AS
+            SELECT g.game_id, g.season_id, g.game_type_id,
+            {flags}
+            FROM lake_games g
+            """
+        )
+
+        game_types = ", ".join(str(t) for t in GAME_TYPES)
+        self.con.execute(
+            f"""
+            CREATE OR REPLACE VIEW vw_stg_request_teams_seasons_gametypes_id AS
+            SELECT DISTINCT team_id, season_id, game_type_id
+            FROM (
+                SELECT home_team_id AS team_id, season_id, game_type_id FROM lake_games
+                UNION ALL
+                SELECT visiting_team_id, season_id, game_type_id FROM lake_games
+            )
+            WHERE game_type_id IN ({game_types})
+            """
+        )
+
+        # boxscore: playerByGameStats.{awayTeam,homeTeam}.{forwards,defense,goalies}[].playerId
+        details_files = Path(details.output_dir) / "**" / f"{details.file_pattern}*"
+        self.con.execute(
+            f"""
+            CREATE OR REPLACE VIEW lake_game_players AS
+            SELECT DISTINCT
+                CAST(player_id AS BIGINT) AS player_id,
+                CAST(json_extract_string(json, '$.season') AS BIGINT) AS season_id,
+                CAST(json_extract_string(json, '$.gameType') AS INTEGER) AS game_type_id
+            FROM (
+                SELECT json, unnest(json_extract_string(json, '$.playerByGameStats.*.*[*].playerId')) AS player_id
+                FROM read_json_objects({_sql_str(details_files)}, format = 'auto', compression = 'auto_detect')
+            )
+            """
+        )
+        self.con.execute(
+            """
+            CREATE OR REPLACE VIEW vw_stg_request_players_id AS
+            SELECT DISTINCT player_id FROM lake_game_players
+            """
+        )
+        self.con.execute(
+            f"""
+            CREATE OR REPLACE VIEW vw_stg_request_players_seasons_gametypes_id AS
+            SELECT player_id, season_id, game_type_id
+            FROM lake_game_players
+            WHERE game_type_id IN ({game_types})
+            """
+        )
+
+    def close(self):
+        self.con.close()
+
+
+def _build_query(table: str, cols: List[str], bool_filter: Optional[tuple[str, bool]]) -> str:
+    sql = f"SELECT DISTINCT {', '.join(cols)} FROM {table}"
+    if bool_filter:
+        col, value = bool_filter
+        sql += f" WHERE {col} IS {'TRUE' if value else 'FALSE'}"
+    return sql
+
+
+def _iter_lake(
+    sql: str,
+    single: bool,
+    catalog: Optional[LakeCatalog],
+    chunk_size: int,
+) -> Iterator[Any]:
+    own_catalog = catalog is None
+    catalog = catalog or LakeCatalog()
+    try:
+        result = catalog.con.execute(sql)
+        while chunk := result.fetchmany(chunk_size):
+            for row in chunk:
+                yield row[0] if single else row
+    finally:
+        if own_catalog:
+            catalog.close()
+
+
+def get_data_from_lake(
+    table: str,
+    cols: List[str],
+    output_csv: Optional[Path] = None,
+    return_as: str = "list",  # "list", "tuples", "df", "iter"
+    bool_filter: Optional[tuple[str, bool]] = None,  # ("has_games_details", False)
+    catalog: Optional[LakeCatalog] = None,
+    chunk_size: int = 10_000,
+):
+    """Same contract as `get_data_from_db`, answered by DuckDB over the raw lake.
+
+    `table` is one of the `LakeCatalog` views; DISTINCT runs in DuckDB and
+    "list"/"tuples"/"iter" results never go through a DataFrame.
+    """
+    sql = _build_query(table, cols, bool_filter)
+    if return_as == "iter" and not output_csv:
+        return _iter_lake(sql, len(cols) == 1, catalog, chunk_size)
+
+    own_catalog = catalog is None
+    catalog = catalog or LakeCatalog()
+    try:
+        # -----------------------------
+        # Salva CSV se solicitado
+        # -----------------------------
+        if output_csv:
+            output_csv = Path(output_csv)
+            output_csv.parent.mkdir(parents=True, exist_ok=True)
+            catalog.con.execute(f"COPY ({sql}) TO {_sql_str(output_csv)} (HEADER, DELIMITER ',')")
+
+        # -----------------------------
+        # Retornos
+        # -----------------------------
+        if return_as == "df":
+            return catalog.con.execute(sql).df()
+
+        if return_as == "list":
+            if len(cols) != 1:
+                raise ValueError("list return requires exactly one column")
+            return [row[0] for row in catalog.con.execute(sql).fetchall()]
+
+        if return_as == "tuples":
+            return catalog.con.execute(sql).fetchall()
+
+        if return_as == "iter":
+            # CSV já escrito: materializa para poder fechar o catálogo
+            rows = catalog.con.execute(sql).fetchall()
+            return iter([row[0] for row in rows] if len(cols) == 1 else rows)
+
+        raise ValueError("return_as must be: 'list', 'tuples', 'df' or 'iter'")
+    finally:
+        if own_catalog:
+            catalog.close()
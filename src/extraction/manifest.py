@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import hashlib
+import sqlite3
+import threading
+
+from ..compression import open_read
+
+
+MANIFEST_FILENAME = "_manifest.sqlite"
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def body_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """sha256 of the decompressed content, i.e. of the response body the file was saved from."""
+    digest = hashlib.sha256()
+    with open_read(path) as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionManifest:
+    """SQLite index of every file saved under an endpoint's `output_dir`.
+
+    Keys are paths relative to `output_dir`, so season subfolders are covered.
+    `content_hash` is the sha256 of the response body (uncompressed), as
+    computed by the extractor. Every record is committed right away (cheap in
+    WAL mode), so a killed run never loses files it already saved.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILENAME
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extracted_files (
+                    relpath      TEXT PRIMARY KEY,
+                    size         INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    saved_at     TEXT NOT NULL
+                )
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def relpath(self, path: Path) -> str:
+        return Path(path).relative_to(self.output_dir).as_posix()
+
+    def relpaths(self) -> set[str]:
+        with self._lock:
+            rows = self._connection().execute("SELECT relpath FROM extracted_files").fetchall()
+        return {row[0] for row in rows}
+
+    def contains(self, path: Path) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT 1 FROM extracted_files WHERE relpath = ?", (self.relpath(path),)
+            ).fetchone()
+        return row is not None
+
+    def record(self, path: Path, content_hash: Optional[str] = None):
+        """Records a saved file; the file is only read when `content_hash` is not given."""
+        path = Path(path)
+        size = path.stat().st_size
+        content_hash = content_hash or body_sha256(path)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """
+                INSERT INTO extracted_files (relpath, size, content_hash, saved_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (relpath) DO UPDATE SET
+                    size = excluded.size,
+                    content_hash = excluded.content_hash,
+                    saved_at = excluded.saved_at
+                """,
+                (self.relpath(path), size, content_hash, datetime.now(timezone.utc).isoformat()),
+            )
+            conn.commit()
+
+    def move(self, source: Path, target: Path):
+        """Moves the record of `source` to `target` (same file, moved within `output_dir`).
+
+        Size and hash are kept; a file that was never recorded is recorded now.
+        """
+        with self._lock:
+            conn = self._connection()
+            moved = conn.execute(
+                """
+                INSERT OR REPLACE INTO extracted_files (relpath, size, content_hash, saved_at)
+                SELECT ?, size, content_hash, saved_at FROM extracted_files WHERE relpath = ?
+                """,
+                (self.relpath(target), self.relpath(source)),
+            ).rowcount
+            conn.execute("DELETE FROM extracted_files WHERE relpath = ?", (self.relpath(source),))
+            conn.commit()
+        if not moved:
+            self.record(target)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,150 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import urlsplit
+import asyncio
+import logging
+import threading
+import time
+
+
+DEFAULT_HOST_RATES = {
+    "api-web.nhle.com": 10.0,
+    "api.nhle.com": 5.0,
+}
+
+
+def parse_retry_after(value: Optional[str]) -> float | None:
+    """Parses a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose refill rate adapts with AIMD.
+
+    Every success adds `increase_step` req/s (up to `max_rate`); every throttle
+    multiplies the rate by `decrease_factor` (down to `min_rate`) and blocks the
+    bucket until `Retry-After` elapses. Throttles arriving within `cooldown`
+    seconds of the previous decrease count once, since a burst of in-flight
+    requests is usually rejected together.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate * 4
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def _reserve(self) -> float:
+        """Takes a token if available, otherwise returns how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._blocked_until > now:
+                return self._blocked_until - now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while (wait := self._reserve()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        while (wait := self._reserve()) > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self._last_decrease = now
+            self._tokens = 0.0
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self._blocked_until = max(self._blocked_until, now + pause)
+
+
+class RateLimiter:
+    """Per-host token buckets shared by every thread or task of a run."""
+
+    def __init__(
+        self,
+        host_rates: Optional[dict[str, float]] = None,
+        default_rate: float = 5.0,
+        **bucket_kwargs,
+    ):
+        self.host_rates = {**DEFAULT_HOST_RATES, **(host_rates or {})}
+        self.default_rate = default_rate
+        self._bucket_kwargs = bucket_kwargs
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            if host not in self._buckets:
+                rate = self.host_rates.get(host, self.default_rate)
+                self._buckets[host] = TokenBucket(rate, **self._bucket_kwargs)
+            return self._buckets[host]
+
+    def acquire(self, url: str):
+        self.bucket(url).acquire()
+
+    async def acquire_async(self, url: str):
+        await self.bucket(url).acquire_async()
+
+    def on_success(self, url: str):
+        self.bucket(url).on_success()
+
+    def on_throttle(self, url: str, retry_after: Optional[float] = None):
+        bucket = self.bucket(url)
+        bucket.on_throttle(retry_after)
+        self.logger.warning(
+            f"Throttled by {urlsplit(url).hostname}; rate lowered to {bucket.rate:.2f} req/s"
+            + (f", retrying after {retry_after:.1f}s" if retry_after is not None else "")
+        )
@@ -0,0 +1,173 @@
+from time import sleep
+from typing import Iterator, Mapping, Optional, Protocol
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+
+RETRY_STATUSES = (500, 502, 503, 504)
+THROTTLE_STATUSES = (403, 429)
+
+
+def _httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("HttpxTransport requires the 'httpx' package (pip install 'nhl[http2]')") from e
+    return httpx
+
+
+class TransportResponse(Protocol):
+    """What `Extractor` uses from a response; `requests.Response` already matches it."""
+    status_code: int
+    headers: Mapping[str, str]
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]: ...
+    def json(self): ...
+    def close(self): ...
+    def __enter__(self): ...
+    def __exit__(self, *exc): ...
+
+
+class Transport(Protocol):
+    """Sends GET requests for `Extractor`.
+
+    `errors` lists the exception types of network failures, which the
+    extractor logs and turns into a missing result.
+    """
+    errors: tuple[type[BaseException], ...]
+
+    def get(self, url: str, timeout: float, headers: Optional[dict] = None, stream: bool = False) -> TransportResponse: ...
+    def close(self): ...
+
+
+class RequestsTransport:
+    """HTTP/1.1 keep-alive via a `requests.Session`.
+
+    urllib3 keeps at most `pool_maxsize` connections per host, so it should
+    be at least the number of threads sharing the session (the default of
+    10 makes extra threads open and drop connections). 5xx responses, and
+    403/429 when `retry_throttled`, are retried with exponential backoff.
+    Without `retry_throttled` urllib3 must also ignore Retry-After, otherwise
+    it still retries (and sleeps on) every 429 that carries the header before
+    the caller's rate limiter sees it.
+    """
+
+    errors = (requests.exceptions.RequestException,)
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        retry_throttled: bool = True,
+    ):
+        status_forcelist = list(RETRY_STATUSES)
+        if retry_throttled:
+            status_forcelist = [*THROTTLE_STATUSES, *status_forcelist]
+
+        retry = Retry(
+            total=retries,
+            status_forcelist=status_forcelist,
+            allowed_methods=["GET"],
+            backoff_factor=backoff_factor,
+            raise_on_status=False,
+            respect_retry_after_header=retry_throttled,
+        )
+
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, timeout: float, headers: Optional[dict] = None, stream: bool = False) -> requests.Response:
+        return self.session.get(url, timeout=timeout, headers=headers, stream=stream)
+
+    def close(self):
+        self.session.close()
+
+
+class _HttpxResponse:
+    """Adapts a streamed `httpx.Response` to `TransportResponse`."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        return self._response.iter_bytes(chunk_size=chunk_size)
+
+    def json(self):
+        self._response.read()
+        return self._response.json()
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HttpxTransport:
+    """`httpx.Client` transport; with `http2=True` concurrent requests share
+    one multiplexed connection per host instead of one socket per thread.
+
+    HTTP/2 needs the `http2` extra (`pip install 'nhl[http2]'`). The client is
+    thread-safe, so one instance serves every `ConcurrentExtractor` worker.
+    5xx responses (and 403/429 when `retry_throttled`) are retried with the
+    same exponential backoff as `RequestsTransport`.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        retry_throttled: bool = True,
+    ):
+        httpx = _httpx()
+        self.errors = (httpx.HTTPError,)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.retry_statuses = (*THROTTLE_STATUSES, *RETRY_STATUSES) if retry_throttled else RETRY_STATUSES
+        # Com transport= o Client ignora seus próprios limits/http2: vão no HTTPTransport
+        self.client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+                retries=retries,  # retries de conexão
+            ),
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, url: str, timeout: float, headers: Optional[dict] = None, stream: bool = False) -> _HttpxResponse:
+        request = self.client.build_request("GET", url, headers=headers, timeout=timeout)
+        for attempt in range(self.retries + 1):
+            response = self.client.send(request, stream=True)
+            if response.status_code not in self.retry_statuses or attempt == self.retries:
+                break
+            response.close()
+            sleep(self.backoff_factor * (2 ** attempt))
+        if not stream:
+            response.read()
+        return _HttpxResponse(response)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,244 @@
+from dataclasses import dataclass
+from pathlib import Path
+from time import sleep, time
+from typing import Callable, Iterable, Iterator, Optional
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class WorkItem:
+    queue: str
+    key: str
+    params: dict
+    attempts: int
+
+
+class WorkQueue:
+    """Durable SQLite work queue shared by extraction runs and processes.
+
+    Each queue (one per endpoint) holds one item per parameter row, moving
+    through pending → in_flight → done, or back to pending on failure until
+    `max_attempts` is reached (then failed). An in-flight item whose lease
+    expired (its worker died) is leased again, so a killed run loses at most
+    the items in flight.
+
+    `populate` fills a queue once per run: while it still has pending or
+    in-flight items every restart resumes it instead of recomputing the
+    work list; once drained, the next call starts a new run. Leasing uses
+    `BEGIN IMMEDIATE`, so several processes can drain the same queue.
+    """
+
+    def __init__(self, path: Path, lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = logging.getLogger(__name__)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS work_queues (
+                    queue      TEXT PRIMARY KEY,
+                    status     TEXT NOT NULL,  -- populating | ready
+                    owner      TEXT,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS work_items (
+                    queue       TEXT NOT NULL,
+                    key         TEXT NOT NULL,
+                    state       TEXT NOT NULL,
+                    attempts    INTEGER NOT NULL DEFAULT 0,
+                    lease_until REAL,
+                    worker      TEXT,
+                    last_error  TEXT,
+                    updated_at  REAL NOT NULL,
+                    PRIMARY KEY (queue, key)
+                );
+                CREATE INDEX IF NOT EXISTS work_items_state_idx ON work_items (queue, state, lease_until);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def key_for(params: dict) -> str:
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def _has_unfinished(self, conn: sqlite3.Connection, queue: str) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM work_items WHERE queue = ? AND state IN (?, ?) LIMIT 1",
+            (queue, PENDING, IN_FLIGHT),
+        ).fetchone()
+        return row is not None
+
+    def _claim_population(self, queue: str) -> Optional[bool]:
+        """True: this worker must populate; False: resume; None: another worker is populating."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT status, updated_at FROM work_queues WHERE queue = ?", (queue,)
+                ).fetchone()
+                if row and row[0] == "ready" and self._has_unfinished(conn, queue):
+                    conn.execute("COMMIT")
+                    return False
+                if row and row[0] == "populating" and time() - row[1] < self.lease_seconds:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    """
+                    INSERT INTO work_queues (queue, status, owner, updated_at) VALUES (?, 'populating', ?, ?)
+                    ON CONFLICT (queue) DO UPDATE SET
+                        status = excluded.status, owner = excluded.owner, updated_at = excluded.updated_at
+                    """,
+                    (queue, self.worker, time()),
+                )
+                conn.execute("DELETE FROM work_items WHERE queue = ?", (queue,))
+                conn.execute("COMMIT")
+                return True
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def populate(
+        self,
+        queue: str,
+        rows_fn: Callable[[], Iterable[dict]],
+        batch_size: int = 5_000,
+    ) -> bool:
+        """Fills `queue` from `rows_fn()` unless an unfinished run can be resumed.
+
+        Returns:
+            bool: True if the queue was (re)populated, False if resuming
+        """
+        while (claim := self._claim_population(queue)) is None:
+            self.logger.info(f"Waiting for another worker to populate queue {queue}")
+            sleep(1.0)
+        if claim is False:
+            self.logger.info(f"Resuming queue {queue}: {self.counts(queue)}")
+            return False
+
+        total = 0
+        batch: list[tuple] = []
+
+        def flush():
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO work_items (queue, key, state, updated_at) VALUES (?, ?, ?, ?)",
+                    batch,
+                )
+                conn.execute("UPDATE work_queues SET updated_at = ? WHERE queue = ?", (time(), queue))
+                conn.execute("COMMIT")
+
+        try:
+            now = time()
+            for params in rows_fn():
+                batch.append((queue, self.key_for(params), PENDING, now))
+                if len(batch) >= batch_size:
+                    flush()
+                    total += len(batch)
+                    batch = []
+            if batch:
+                flush()
+                total += len(batch)
+        except BaseException:
+            with self._lock:
+                # população incompleta: a próxima execução recomeça do zero
+                self._connection().execute("DELETE FROM work_queues WHERE queue = ?", (queue,))
+            raise
+
+        with self._lock:
+            self._connection().execute(
+                "UPDATE work_queues SET status = 'ready', updated_at = ? WHERE queue = ?", (time(), queue)
+            )
+        self.logger.info(f"Queue {queue} populated with {total} item(s)")
+        return True
+
+    def lease(self, queue: str, limit: int) -> list[WorkItem]:
+        """Moves up to `limit` pending (or lease-expired) items to in_flight for this worker."""
+        with self._lock:
+            conn = self._connection()
+            now = time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT key, attempts FROM work_items
+                    WHERE queue = ? AND (state = ? OR (state = ? AND lease_until < ?))
+                    ORDER BY rowid
+                    LIMIT ?
+                    """,
+                    (queue, PENDING, IN_FLIGHT, now, limit),
+                ).fetchall()
+                conn.executemany(
+                    """
+                    UPDATE work_items
+                    SET state = ?, attempts = attempts + 1, lease_until = ?, worker = ?, updated_at = ?
+                    WHERE queue = ? AND key = ?
+                    """,
+                    [(IN_FLIGHT, now + self.lease_seconds, self.worker, now, queue, key) for key, _ in rows],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return [WorkItem(queue, key, json.loads(key), attempts + 1) for key, attempts in rows]
+
+    def complete(self, item: WorkItem):
+        with self._lock:
+            self._connection().execute(
+                "UPDATE work_items SET state = ?, lease_until = NULL, updated_at = ? WHERE queue = ? AND key = ?",
+                (DONE, time(), item.queue, item.key),
+            )
+
+    def fail(self, item: WorkItem, error: Optional[str] = None):
+        """Back to pending for another attempt, or failed after `max_attempts`."""
+        state = FAILED if item.attempts >= self.max_attempts else PENDING
+        with self._lock:
+            self._connection().execute(
+                """
+                UPDATE work_items SET state = ?, lease_until = NULL, last_error = ?, updated_at = ?
+                WHERE queue = ? AND key = ?
+                """,
+                (state, error, time(), item.queue, item.key),
+            )
+
+    def consume(self, queue: str, batch_size: int = 16) -> Iterator[WorkItem]:
+        """Leases and yields items until nothing is left to lease (other workers may still hold some)."""
+        while items := self.lease(queue, batch_size):
+            yield from items
+
+    def counts(self, queue: str) -> dict[str, int]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT state, count(*) FROM work_items WHERE queue = ? GROUP BY state", (queue,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,47 @@
+from typing import AnyStr, Generic, Iterable
+
+
+class CopyStream(Generic[AnyStr]):
+    """Read-only file-like adapter over an iterator of str or bytes chunks.
+
+    `cursor.copy_expert` only calls `read(size)`, so COPY rows can be produced
+    lazily by a generator instead of being materialized in an `io.StringIO`.
+    Chunks are consumed on demand and never concatenated beyond one `read`.
+    """
+
+    def __init__(self, chunks: Iterable[AnyStr]):
+        self._chunks = iter(chunks)
+        self._current: AnyStr | None = None
+        self._pos = 0
+        self._empty: AnyStr | None = None
+
+    def _next_chunk(self) -> bool:
+        for chunk in self._chunks:
+            if self._empty is None:
+                self._empty = chunk[:0]
+            if chunk:
+                self._current, self._pos = chunk, 0
+                return True
+        self._current, self._pos = None, 0
+        return False
+
+    def read(self, size: int = -1) -> AnyStr:
+        parts = []
+        remaining = size if size is not None and size >= 0 else None
+
+        while remaining is None or remaining > 0:
+            if self._current is None or self._pos >= len(self._current):
+                if not self._next_chunk():
+                    break
+            end = len(self._current) if remaining is None else self._pos + remaining
+            part = self._current[self._pos:end]
+            self._pos += len(part)
+            parts.append(part)
+            if remaining is not None:
+                remaining -= len(part)
+
+        empty = self._empty if self._empty is not None else ""
+        return empty.join(parts)
+
+    def readable(self) -> bool:
+        return True
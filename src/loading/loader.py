@@ -1,13 +1,51 @@
-import json
-import io
+import multiprocessing
+import queue
+import threading
 import psycopg2
+from contextlib import contextmanager
 from psycopg2.extensions import connection as PGConn 
+from psycopg2.extras import execute_values
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from itertools import chain
 from pathlib import Path
-from typing import Iterable, Callable, Optional
+from typing import Iterable, Iterator, Callable, Optional
 from ...endpoints import EndpointConfig
+from ..db import release_connection
+from ..extraction.manifest import file_sha256
+from .copy_stream import CopyStream
+from .serialization import frame_copy_rows, iter_copy_rows, serialize_file
 import logging
 
 
+COPY_READ_SIZE = 1 << 16
+OVERWRITE_STRATEGIES = ("truncate", "swap", "merge")
+
+
+@dataclass
+class FileState:
+    """Content fingerprint of a raw file as stored in raw.nhl_ingestion_control."""
+    filename: str
+    content_hash: Optional[str]
+    file_size: int
+    file_mtime_ns: int
+
+
+@dataclass
+class FileDiff:
+    """Files to load compared with what the control table already has."""
+    states: dict[Path, FileState] = field(default_factory=dict)
+    new: list[Path] = field(default_factory=list)
+    changed: list[Path] = field(default_factory=list)
+    touched: list[Path] = field(default_factory=list)  # só metadados mudaram (mtime, hash legado)
+    unchanged: int = 0
+    removed: set[str] = field(default_factory=set)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.new or self.changed or self.removed)
+
+
 class Loader:
     def __init__(
         self,
@@ -19,6 +57,8 @@ class Loader:
         connection_provider: Optional[Callable[[], PGConn]] = None,
     ):
         self._connection_provider = connection_provider
+        self._schema_ready: set[str] = set()  # tabelas cujo DDL/migração já foi commitado por este Loader
+        self._schema_lock = threading.Lock()
         self._conn_params = {
             "host": host,
             "port": port,
@@ -39,10 +79,46 @@ class Loader:
             return psycopg2.connect(**self._conn_params)
         except:
             raise ConnectionError("Check credentials or if instance is running")
+
+    def _release_connection(self, conn: PGConn):
+        """Closes connections opened here; pooled ones go back to their pool (see `PooledConnectionProvider`)."""
+        if self._connection_provider is None:
+            conn.close()
+        else:
+            release_connection(self._connection_provider, conn)
+
+    @contextmanager
+    def _transaction(self, conn: PGConn) -> Iterator[PGConn]:
+        """Commits on success and rolls back on error, like `with conn` but also for pool proxies."""
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                self.logger.warning("Rollback failed; connection is probably broken")
+            raise
+
+    @contextmanager
+    def _connection(self) -> Iterator[PGConn]:
+        """One transaction on a connection that is released when the block ends."""
+        conn = self._get_connection()
+        try:
+            with self._transaction(conn):
+                yield conn
+        finally:
+            self._release_connection(conn)
         
     # ------------------------
     # DDL
     # ------------------------
+    @staticmethod
+    def _process_pool(processes: Optional[int]) -> ProcessPoolExecutor:
+        """Serialization pool started with spawn: forking a process that already runs
+        threads holding psycopg2 connections can leave locks and sockets broken in the child."""
+        return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+
     def _ensure_table(self, config: EndpointConfig, cur):
         """Creates the table for the data to be loaded as JSONB using the provided cursor."""
         
@@ -64,8 +140,7 @@ class Loader:
             cur.execute(f"TRUNCATE TABLE {config.schema}.{config.table_name}")
             self.logger.info(f"Table truncated: {config.schema}.{config.table_name}")
 
-    def _ensure_control_table(self, config: EndpointConfig, cur):
-        """Create control table if needed and delete ingestion metadata records if is overwrite."""
+    def _create_control_table(self, cur):
         ddl = """
         CREATE TABLE IF NOT EXISTS raw.nhl_ingestion_control (
             table_schema TEXT NOT NULL,
@@ -77,176 +152,821 @@ class Loader:
         );
         """
         cur.execute(ddl)
-        
-        self.logger.info(f"Ingestion control table created if needed: raw.nhl_ingestion_control")
 
-        if config.is_overwrite:
-            ddl_delete = """
-                DELETE FROM raw.nhl_ingestion_control
-                WHERE table_schema=%s AND table_name=%s
+        # ALTER TABLE ... IF NOT EXISTS também pega ACCESS EXCLUSIVE: só migra se faltar coluna
+        cur.execute(
+            """
+            SELECT count(*) FROM information_schema.columns
+            WHERE table_schema = 'raw' AND table_name = 'nhl_ingestion_control'
+              AND column_name IN ('content_hash', 'file_size', 'file_mtime_ns')
             """
+        )
+        if cur.fetchone()[0] < 3:
             cur.execute(
-                ddl_delete,
-                (config.schema, config.table_name)
+                """
+                ALTER TABLE raw.nhl_ingestion_control
+                    ADD COLUMN IF NOT EXISTS content_hash  TEXT,
+                    ADD COLUMN IF NOT EXISTS file_size     BIGINT,
+                    ADD COLUMN IF NOT EXISTS file_mtime_ns BIGINT;
+                """
             )
-            self.logger.info(f"Preparing overwrite loading. Deleted ingestion records for {config.schema}.{config.table_name}")
+            self.logger.info("Ingestion control table migrated: content_hash, file_size, file_mtime_ns")
+
+        self.logger.info(f"Ingestion control table created if needed: raw.nhl_ingestion_control")
+
+    def _ensure_schema(self, config: EndpointConfig):
+        """Target table, control table and natural key, once per Loader and table.
+
+        Runs and commits in its own short transaction before the load opens
+        its own, so DDL locks are never held across a load (nor repeated by
+        every batch, stream or partition worker sharing this Loader).
+        """
+        target = f"{config.schema}.{config.table_name}"
+        if target in self._schema_ready:
+            return
+        with self._schema_lock:
+            if target in self._schema_ready:
+                return
+            with self._connection() as conn, conn.cursor() as cur:
+                self._ensure_table(config, cur)
+                self._create_control_table(cur)
+                if self._uses_merge(config):
+                    self._ensure_natural_key(config, cur)
+            self._schema_ready.add(target)
+
+    def _clear_ingestion_records(self, config: EndpointConfig, cur):
+        ddl_delete = """
+            DELETE FROM raw.nhl_ingestion_control
+            WHERE table_schema=%s AND table_name=%s
+        """
+        cur.execute(
+            ddl_delete,
+            (config.schema, config.table_name)
+        )
+        self.logger.info(f"Preparing overwrite loading. Deleted ingestion records for {config.schema}.{config.table_name}")
 
     # ------------------------
-    # JSON → NDJSON (streaming em memória)
+    # OVERWRITE VIA STAGING + SWAP
     # ------------------------
-    def _json_to_buffer(self, input_path: Path, array_key: str | None, source_filename: str) -> io.StringIO:
-        """Serializes json file.
+    def _overwrite_strategy(self, config: EndpointConfig) -> str | None:
+        """Validated overwrite strategy of the endpoint, None for append endpoints."""
+        if config.overwrite_strategy not in OVERWRITE_STRATEGIES:
+            raise ValueError(
+                f"overwrite_strategy must be one of {OVERWRITE_STRATEGIES}, got '{config.overwrite_strategy}'"
+            )
+        if config.overwrite_strategy == "merge" and not config.natural_key:
+            raise ValueError(f"overwrite_strategy='merge' requires natural_key on {config.table_name}")
+        return config.overwrite_strategy if config.is_overwrite else None
 
-        Args:
-            input_path (Path): JSON file to be serialized
-            array_key (str | None): Parses through provided array key
-            source_filename (str): Metadata
+    def _uses_swap(self, config: EndpointConfig) -> bool:
+        return self._overwrite_strategy(config) == "swap"
+
+    def _uses_merge(self, config: EndpointConfig) -> bool:
+        return self._overwrite_strategy(config) == "merge"
 
-        Raises:
-            ValueError: Invalid JSON in input_path
-            ValueError: Invalid array key or not list of dicts
+    def _build_staging(self, config: EndpointConfig, filepaths: list[Path], cur) -> EndpointConfig:
+        """Creates a copy of the target table and COPYs every file into it.
 
-        Returns:
-            io.StringIO: Buffer content
+        The staging table is a regular (logged) table: it becomes the live table
+        after the swap, and making an UNLOGGED one crash-safe afterwards would
+        rewrite it through WAL anyway.
         """
-        buffer = io.StringIO()
+        staging = replace(config, table_name=f"{config.table_name}__staging")
+        target = f"{config.schema}.{config.table_name}"
+        staging_table = f"{staging.schema}.{staging.table_name}"
 
-        with input_path.open("r", encoding="utf-8") as f:
-            raw_text = f.read()
+        cur.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        cur.execute(f"CREATE TABLE {staging_table} (LIKE {target} INCLUDING ALL)")
 
-        try:
-            data = json.loads(raw_text)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in file {input_path}: {e}")
-
-        if isinstance(data, list):
-            iterable = data
-        elif isinstance(data, dict) and array_key:
-            if array_key not in data or not isinstance(data[array_key], list):
-                raise ValueError(f"array_key '{array_key}' not found or it is not list of dicts")
-            iterable = data[array_key]
-        else:
-            iterable = [data]
+        rows = chain.from_iterable(self._json_to_rows(p, config, p.name) for p in filepaths)
+        self._copy_payload(rows, staging, cur)
+        self.logger.info(f"Staging table built: {staging_table} ({len(filepaths)} file(s))")
+        return staging
 
-        for idx, item in enumerate(iterable, start=1):
-            try:
-                # Gera JSON compactado
-                json_text = json.dumps(item, ensure_ascii=False, separators=(',', ':'))
-                json.loads(json_text)  # validação
-            except Exception as e:
-                raise ValueError(
-                    f"Invalid JSON payload in file {input_path} "
-                    f"(record {idx}): {e}"
-                )
+    def _swap_tables(self, config: EndpointConfig, staging: EndpointConfig, cur, states: Optional[list[FileState]]):
+        """Renames staging over the target table within the caller's transaction.
 
-            # Escape para TEXT format do PostgreSQL
-            escaped = (
-                json_text
-                .replace("\\", "\\\\")  # \ → \\
-                .replace("\n", "\\n")   # newline → \n
-                .replace("\r", "\\r")   # CR → \r
-                .replace("\t", "\\t")   # tab → \t
+        Views bind to the table OID, so views depending on the old table are
+        recreated with their own definition (captured before the rename) to point
+        at the new one before the old table is dropped. `LIKE` copies neither
+        owner nor GRANTs, so both are carried over from the old table. When
+        `states` is given, the control records are replaced in the same transaction.
+        """
+        target = f"{config.schema}.{config.table_name}"
+        old_name = f"{config.table_name}__old"
+
+        cur.execute("SET LOCAL lock_timeout = '30s'")
+        cur.execute(
+            """
+            SELECT quote_ident(pg_get_userbyid(relowner)), pg_get_userbyid(relowner) <> current_user
+            FROM pg_class WHERE oid = %s::regclass
+            """,
+            (target,),
+        )
+        owner, owner_differs = cur.fetchone()
+        cur.execute(
+            """
+            SELECT CASE WHEN a.grantee = 0 THEN 'PUBLIC' ELSE quote_ident(pg_get_userbyid(a.grantee)) END,
+                   a.privilege_type, a.is_grantable
+            FROM pg_class c, aclexplode(c.relacl) a
+            WHERE c.oid = %s::regclass
+            """,
+            (target,),
+        )
+        grants = cur.fetchall()
+        cur.execute(
+            """
+            SELECT DISTINCT v.oid::regclass::text, pg_get_viewdef(v.oid)
+            FROM pg_depend d
+            JOIN pg_rewrite r ON r.oid = d.objid
+            JOIN pg_class v ON v.oid = r.ev_class
+            WHERE d.refobjid = %s::regclass
+              AND v.relkind = 'v'
+            """,
+            (target,),
+        )
+        dependent_views = cur.fetchall()
+
+        cur.execute(f"ALTER TABLE {target} RENAME TO {old_name}")
+        cur.execute(f"ALTER TABLE {staging.schema}.{staging.table_name} RENAME TO {config.table_name}")
+        if owner_differs:
+            cur.execute(f"ALTER TABLE {target} OWNER TO {owner}")
+        for grantee, privilege, grantable in grants:
+            cur.execute(
+                f"GRANT {privilege} ON {target} TO {grantee}" + (" WITH GRANT OPTION" if grantable else "")
             )
-            
-            buffer.write(f"{escaped}\t{source_filename}\n")
+        for view_name, view_def in dependent_views:
+            cur.execute(f"CREATE OR REPLACE VIEW {view_name} AS {view_def}")
+        cur.execute(f"DROP TABLE {config.schema}.{old_name}")
+
+        if states is not None:
+            self._clear_ingestion_records(config, cur)
+            self._register_ingestion_batch(cur, config, states)
+
+        self.logger.info(
+            f"Swapped staging into {target} ({len(dependent_views)} dependent view(s) rebound, "
+            f"{len(grants)} grant(s) reapplied)"
+        )
+
+    def _swap_load(self, config: EndpointConfig, filepaths: list[Path], register: bool = True):
+        """Overwrite load that never truncates or empties the live table."""
+        if not filepaths:
+            self.logger.warning(f"No files to load; keeping {config.schema}.{config.table_name} as is")
+            return
+
+        self._ensure_schema(config)
+        with self._connection() as conn, conn.cursor() as cur:
+            states = None
+            if register:
+                diff = self._diff_files(config, filepaths, cur)
+                if not diff.has_changes:
+                    self._register_ingestion_batch(cur, config, [diff.states[p] for p in diff.touched])
+                    conn.commit()
+                    self.logger.info(f"No file changed; keeping {config.schema}.{config.table_name} as is")
+                    return
+                states = [diff.states[p] for p in filepaths]
+            conn.commit()
+
+            staging = self._build_staging(config, filepaths, cur)
+            conn.commit()
 
-        buffer.seek(0)
-        return buffer
+            self._swap_tables(config, staging, cur, states)
+            conn.commit()
+            self.logger.info(f"Loading complete! Data loaded on: {config.schema}.{config.table_name}")
+
+    # ------------------------
+    # JSON → linhas COPY (streaming)
+    # ------------------------
+    def _json_to_rows(self, input_path: Path, config: EndpointConfig, source_filename: str) -> Iterator[bytes]:
+        """Lazy COPY rows for one json file in the endpoint's `copy_format` (see `iter_copy_rows`)."""
+        return iter_copy_rows(input_path, config.array_key, source_filename, config.copy_format)
+
+    def _file_rows(
+        self,
+        config: EndpointConfig,
+        filepaths: list[Path],
+        procs: Optional[ProcessPoolExecutor] = None,
+        window: int = 64,
+    ) -> Iterator[bytes]:
+        """COPY rows of many files, serialized lazily or in `procs` (one buffer per file).
+
+        The pool gets `window` files at a time so at most that many serialized
+        buffers are held in memory.
+        """
+        if procs is None:
+            return chain.from_iterable(self._json_to_rows(p, config, p.name) for p in filepaths)
+
+        def buffers() -> Iterator[bytes]:
+            for i in range(0, len(filepaths), window):
+                chunk = filepaths[i:i + window]
+                yield from procs.map(
+                    serialize_file,
+                    chunk,
+                    [config.array_key] * len(chunk),
+                    [p.name for p in chunk],
+                    [config.copy_format] * len(chunk),
+                )
+        return buffers()
 
     # ------------------------
     # COPY
     # ------------------------
-    def _copy_payload(self, buffer: io.StringIO, config, cur):
+    def _copy_payload(self, rows: Iterable[bytes], config, cur):
+        """Streams unframed COPY rows (text or binary, per `config.copy_format`) into the table."""
+        if config.copy_format == "binary":
+            options = "FORMAT binary"
+        else:
+            options = "FORMAT text, ENCODING 'UTF8'"
         copy_sql = f"""
         COPY {config.schema}.{config.table_name} (payload, source_filename)
-        FROM STDIN WITH (FORMAT text)
+        FROM STDIN WITH ({options})
         """
-        cur.copy_expert(copy_sql, buffer)
+        stream = CopyStream(frame_copy_rows(rows, config.copy_format))
+        cur.copy_expert(copy_sql, stream, size=COPY_READ_SIZE)
 
     # ------------------------
     # IDEMPOTENCIA
     # ------------------------
 
-    def _register_ingestion_conn(self, cur, config, filename: str):
+    def _register_ingestion_conn(self, cur, config, state: FileState):
         """Register ingested files to raw.nhl_ingestion_control """
+        self._register_ingestion_batch(cur, config, [state])
+
+    def _register_ingestion_batch(self, cur, config, states: list[FileState]):
+        """Register (or refresh the fingerprint of) many files in one statement"""
+        if not states:
+            return
         sql = """
             INSERT INTO raw.nhl_ingestion_control (
-                table_schema, table_name, filename, is_overwrite
-            ) VALUES (%s, %s, %s, %s)
-            ON CONFLICT DO NOTHING
+                table_schema, table_name, filename, is_overwrite,
+                content_hash, file_size, file_mtime_ns
+            ) VALUES %s
+            ON CONFLICT (table_schema, table_name, filename) DO UPDATE SET
+                content_hash  = EXCLUDED.content_hash,
+                file_size     = EXCLUDED.file_size,
+                file_mtime_ns = EXCLUDED.file_mtime_ns,
+                ingested_at   = now()
         """
-        cur.execute(
+        execute_values(
+            cur,
             sql,
-            (config.schema, config.table_name, filename, config.is_overwrite)
+            [
+                (
+                    config.schema, config.table_name, state.filename, config.is_overwrite,
+                    state.content_hash, state.file_size, state.file_mtime_ns,
+                )
+                for state in states
+            ],
+            page_size=1000,
         )
 
-    def _load_ingested_filenames(self, config, cur) -> set[str]:
+    def _load_ingested_files(self, config, cur, filenames: list[str]) -> dict[str, FileState]:
+        """Control records of `filenames` only, so a batch never reads the whole table's history."""
         sql = """
-            SELECT filename
+            SELECT filename, content_hash, file_size, file_mtime_ns
             FROM raw.nhl_ingestion_control
             WHERE table_schema = %s
             AND table_name   = %s
+            AND filename = ANY(%s)
         """
         
-        cur.execute(sql, (config.schema, config.table_name))
+        cur.execute(sql, (config.schema, config.table_name, filenames))
+        return {row[0]: FileState(*row) for row in cur.fetchall()}
+
+    def _removed_files(self, config, cur, filenames: list[str]) -> set[str]:
+        """Registered files that are not among `filenames` (only needed by full reloads)."""
+        cur.execute(
+            """
+            SELECT filename FROM raw.nhl_ingestion_control
+            WHERE table_schema = %s AND table_name = %s AND NOT (filename = ANY(%s))
+            """,
+            (config.schema, config.table_name, filenames),
+        )
         return {row[0] for row in cur.fetchall()}
 
+    def _diff_files(self, config: EndpointConfig, filepaths: list[Path], cur) -> FileDiff:
+        """Compares files on disk with their control records.
+
+        Size and mtime equal to the record means unchanged without reading the
+        file; otherwise the sha256 decides between changed and metadata-only
+        (touched). Records without a hash (before this column existed) are
+        backfilled as touched instead of being reloaded. Only the records of
+        `filepaths` are read; gone files are looked up for overwrite endpoints,
+        which reload everything when one disappears.
+        """
+        filenames = [p.name for p in filepaths]
+        ingested = self._load_ingested_files(config, cur, filenames)
+        diff = FileDiff()
+
+        for path in filepaths:
+            stat = path.stat()
+            record = ingested.get(path.name)
+            if (
+                record is not None
+                and record.content_hash is not None
+                and record.file_size == stat.st_size
+                and record.file_mtime_ns == stat.st_mtime_ns
+            ):
+                diff.states[path] = record
+                diff.unchanged += 1
+                continue
+
+            state = FileState(path.name, file_sha256(path), stat.st_size, stat.st_mtime_ns)
+            diff.states[path] = state
+            if record is None:
+                diff.new.append(path)
+            elif record.content_hash is None or record.content_hash == state.content_hash:
+                diff.touched.append(path)
+            else:
+                diff.changed.append(path)
+
+        if config.is_overwrite and not self._uses_merge(config):
+            diff.removed = self._removed_files(config, cur, filenames)
+        return diff
+
+    def _delete_file_rows(self, config: EndpointConfig, filepaths: list[Path], cur):
+        """Removes rows previously loaded from files whose content changed."""
+        cur.execute(
+            f"DELETE FROM {config.schema}.{config.table_name} WHERE source_filename = ANY(%s)",
+            ([p.name for p in filepaths],),
+        )
+        self.logger.info(f"Deleted {cur.rowcount} row(s) of {len(filepaths)} changed file(s)")
+
+    def _plan_load(self, config: EndpointConfig, filepaths: list[Path], cur) -> tuple[list[Path], FileDiff]:
+        """Decides which files must be (re)loaded.
+
+        Append and merge endpoints load only new and changed files. Truncate
+        overwrite endpoints reload everything, but only if some file is new,
+        changed or gone.
+        """
+        diff = self._diff_files(config, filepaths, cur)
+        full_reload = config.is_overwrite and not self._uses_merge(config)
+        if full_reload:
+            to_load = filepaths if diff.has_changes else []
+        else:
+            to_load = diff.new + diff.changed
+
+        self.logger.info(
+            f"Loading {len(to_load)} files from {config.output_dir} "
+            f"({len(diff.new)} new, {len(diff.changed)} changed, {diff.unchanged + len(diff.touched)} unchanged)..."
+        )
+
+        if not to_load:
+            self.logger.warning(
+                f"No new or changed files to ingest for {config.schema}.{config.table_name}. "
+                f"All {len(filepaths)} file(s) were already processed."
+                f"Loading complete!"
+            )
+        return to_load, diff
+
+
+    # ------------------------
+    # UPSERT POR NATURAL KEY
+    # ------------------------
+    def _natural_key_ready(self, config: EndpointConfig, cur) -> bool:
+        """True when the target already has every key column and the unique index (catalog lookups only)."""
+        cur.execute(
+            """
+            SELECT count(*) FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s AND column_name = ANY(%s)
+            """,
+            (config.schema, config.table_name, list(config.natural_key)),
+        )
+        columns = cur.fetchone()[0]
+        cur.execute("SELECT to_regclass(%s)", (f"{config.schema}.{config.table_name}_natural_key_uidx",))
+        return columns == len(config.natural_key) and cur.fetchone()[0] is not None
+
+    def _ensure_natural_key(self, config: EndpointConfig, cur):
+        """One-time migration adding the natural key columns and unique index to the target table.
+
+        Runs from `_ensure_schema` (once per Loader) and only changes anything
+        while the key is missing. Rows loaded before the table had a key (NULL key columns)
+        cannot be matched, so they are deleted with every control record and
+        all files of the endpoint (not just the ones being loaded) are merged
+        again in this same transaction.
+        """
+        if config.array_key:
+            raise ValueError(f"natural_key needs one record per file; {config.table_name} uses array_key")
+        missing = set(config.natural_key) - set(config.filename_fields())
+        if missing:
+            raise ValueError(f"natural_key fields {sorted(missing)} are not in filename '{config.filename}'")
+        if self._natural_key_ready(config, cur):
+            return
+
+        target = f"{config.schema}.{config.table_name}"
+        key_cols = ", ".join(config.natural_key)
+        for key in config.natural_key:
+            cur.execute(f"ALTER TABLE {target} ADD COLUMN IF NOT EXISTS {key} TEXT")
+        cur.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {config.table_name}_natural_key_uidx ON {target} ({key_cols})"
+        )
+        self.logger.info(f"Natural key ({key_cols}) added to {target}")
+
+        cur.execute(f"DELETE FROM {target} WHERE {config.natural_key[0]} IS NULL")
+        if cur.rowcount:
+            self.logger.warning(
+                f"Deleted {cur.rowcount} legacy row(s) without natural key from {target}; reloading every file"
+            )
+            self._clear_ingestion_records(config, cur)
+            self._merge_files(config, config.collect_files(use_cache=False), cur)
+
+    def _merge_files(
+        self,
+        config: EndpointConfig,
+        filepaths: list[Path],
+        cur,
+        register: bool = True,
+        procs: Optional[ProcessPoolExecutor] = None,
+    ) -> int:
+        """Merges files within the caller's transaction; see `_merge_load`."""
+        target = f"{config.schema}.{config.table_name}"
+        stage = replace(config, schema="pg_temp", table_name=f"{config.table_name}__merge")
+        stage_table = f"{stage.schema}.{stage.table_name}"
+        fields = config.filename_fields()
+        key_cols = ", ".join(config.natural_key)
+        key_exprs = ", ".join(f"m[{fields.index(key) + 1}] AS {key}" for key in config.natural_key)
+
+        if register:
+            filepaths, diff = self._plan_load(config, filepaths, cur)
+            self._register_ingestion_batch(cur, config, [diff.states[p] for p in diff.touched])
+
+        if not filepaths:
+            self.logger.warning(f"No files to merge into {target}")
+            return 0
+
+        cur.execute(
+            f"CREATE TEMP TABLE {stage.table_name} "
+            f"(payload JSONB NOT NULL, source_filename TEXT NOT NULL) ON COMMIT DROP"
+        )
+        self._copy_payload(self._file_rows(config, filepaths, procs), stage, cur)
+
+        cur.execute(
+            f"""
+            WITH keyed AS (
+                SELECT payload, source_filename, {key_exprs}
+                FROM (
+                    SELECT payload, source_filename, regexp_match(source_filename, %s) AS m
+                    FROM {stage_table}
+                ) s
+                WHERE m IS NOT NULL
+            )
+            INSERT INTO {target} AS t (payload, source_filename, {key_cols})
+            SELECT DISTINCT ON ({key_cols}) payload, source_filename, {key_cols}
+            FROM keyed
+            ORDER BY {key_cols}, source_filename DESC
+            ON CONFLICT ({key_cols}) DO UPDATE
+            SET payload = EXCLUDED.payload,
+                source_filename = EXCLUDED.source_filename
+            WHERE t.payload IS DISTINCT FROM EXCLUDED.payload
+            """,
+            (config.filename_regex(),),
+        )
+        changed = cur.rowcount
+
+        cur.execute(
+            f"SELECT count(*) FROM {stage_table} WHERE regexp_match(source_filename, %s) IS NULL",
+            (config.filename_regex(),),
+        )
+        unmatched = cur.fetchone()[0]
+        if unmatched:
+            self.logger.warning(f"{unmatched} row(s) skipped: filename does not match '{config.filename}'")
+        cur.execute(f"DROP TABLE {stage_table}")  # a migração pode fazer outro merge na mesma transação
+
+        if register:
+            self._register_ingestion_batch(cur, config, [diff.states[p] for p in filepaths])
+
+        self.logger.info(f"{changed} row(s) inserted or changed in {target} from {len(filepaths)} file(s)")
+        return len(filepaths)
+
+    def _merge_load(
+        self,
+        config: EndpointConfig,
+        filepaths: list[Path],
+        register: bool = True,
+        procs: Optional[ProcessPoolExecutor] = None,
+    ) -> int:
+        """Upserts files by natural key, only touching rows whose payload changed.
+
+        Only new or changed files (by content hash) are read when `register` is
+        set. Files are COPYed into a temporary table; key values are parsed from
+        `source_filename` with `EndpointConfig.filename_regex` and merged with
+        `INSERT ... ON CONFLICT DO UPDATE ... WHERE payload IS DISTINCT FROM`.
+        With `procs`, files are serialized in that process pool. Returns the
+        number of files merged.
+        """
+        self._ensure_schema(config)
+        with self._connection() as conn, conn.cursor() as cur:
+            merged = self._merge_files(config, filepaths, cur, register, procs)
+            conn.commit()
+        if merged:
+            self.logger.info(f"Loading complete! Data merged into {config.schema}.{config.table_name}")
+        return merged
 
     # ------------------------
     # API pública
     # ------------------------
+    def prepare(self, config: EndpointConfig):
+        """Creates (or migrates) the target table, control table and natural key once.
+
+        Loads call this themselves; callers issuing many small loads (see
+        `LoadStream`) call it up front so the setup is paid before the first batch.
+        """
+        self._overwrite_strategy(config)
+        self._ensure_schema(config)
+
     def load(self, config:EndpointConfig):
         """Loads unique file full load"""
-        with self._get_connection() as conn, conn.cursor() as cur:
+        if self._uses_swap(config) or self._uses_merge(config):
+            filepath = Path(config.output_dir) / config.resolve_filename()
+            load_fn = self._swap_load if self._uses_swap(config) else self._merge_load
+            load_fn(config, [filepath], register=False)
+            return
+
+        with self._connection() as conn, conn.cursor() as cur:
             self._ensure_table(config, cur)
             self._prepare_table(config, cur)
-            filepath = Path(config.output_dir) / config.filename
-            buffer = self._json_to_buffer(filepath, config.array_key, config.filename)
+            filename = config.resolve_filename()
+            filepath = Path(config.output_dir) / filename
+            rows = self._json_to_rows(filepath, config, filename)
 
-            self._copy_payload(buffer, config, cur)
+            self._copy_payload(rows, config, cur)
             conn.commit()
             self.logger.info(f"Loading complete! Data loaded on: {config.schema}.{config.table_name}")
 
-    def load_files(self, config: EndpointConfig, filepaths: Iterable[Path]):
-        """Loads multiple files with idempotency"""
-        with self._get_connection() as conn, conn.cursor() as cur:
-            self._ensure_table(config, cur)
+    def _prepare_files(self, config: EndpointConfig, filepaths: list[Path], cur) -> tuple[list[Path], FileDiff]:
+        """Plans the load and clears what the files to load will replace.
+
+        Truncate overwrites empty the table and its control records; append
+        endpoints delete the rows of changed files. Metadata-only updates are
+        registered right away.
+        """
+        new_files, diff = self._plan_load(config, filepaths, cur)
+        self._register_ingestion_batch(cur, config, [diff.states[p] for p in diff.touched])
+        if new_files and config.is_overwrite:
             self._prepare_table(config, cur)
-            self._ensure_control_table(config, cur)
+            self._clear_ingestion_records(config, cur)
+        elif diff.changed:
+            self._delete_file_rows(config, diff.changed, cur)
+        return new_files, diff
 
-            if config.is_overwrite:
-                new_files = list(filepaths)
-            else:
-                ingested = self._load_ingested_filenames(config, cur)
-                new_files = [
-                    p for p in filepaths
-                    if p.name not in ingested
-                ]
-
-            file_count = len(new_files)
-            self.logger.info(f"Loading {file_count} files from {config.output_dir}...")
-            
+    def load_files(
+        self,
+        config: EndpointConfig,
+        filepaths: Iterable[Path],
+        batch_rows: Optional[int] = None,
+        batch_bytes: Optional[int] = None,
+    ):
+        """Loads multiple files with idempotency by content hash.
+
+        With `batch_rows` and/or `batch_bytes`, files are coalesced into large COPY
+        batches (see `_copy_batches`) instead of one COPY and INSERT per file;
+        swap and merge endpoints always use a single COPY and ignore them.
+        Overwrite endpoints with `overwrite_strategy="swap"` are loaded into a
+        staging table and swapped in (see `_swap_tables`); with "merge" they are
+        upserted by `natural_key` (see `_merge_load`).
+        """
+        filepaths = list(filepaths)
+        if (batch_rows or batch_bytes) and (self._uses_swap(config) or self._uses_merge(config)):
+            self.logger.warning(
+                f"batch_rows/batch_bytes are ignored by overwrite_strategy='{config.overwrite_strategy}' "
+                f"({config.table_name} is loaded in a single COPY)"
+            )
+        if self._uses_swap(config):
+            self._swap_load(config, filepaths)
+            return
+        if self._uses_merge(config):
+            self._merge_load(config, filepaths)
+            return
+
+        self._ensure_schema(config)
+        with self._connection() as conn, conn.cursor() as cur:
+            new_files, diff = self._prepare_files(config, filepaths, cur)
             if not new_files:
-                self.logger.warning(
-                    f"No new files to ingest for {config.schema}.{config.table_name}. "
-                    f"All {len(filepaths)} file(s) were already processed."
-                    f"Loading complete!"
-                )
                 return
 
-            for filepath in new_files:
-                buffer = self._json_to_buffer(filepath, config.array_key, filepath.name)
+            if batch_rows or batch_bytes:
+                self._copy_batches(config, new_files, diff.states, cur, batch_rows, batch_bytes)
+            else:
+                for filepath in new_files:
+                    rows = self._json_to_rows(filepath, config, filepath.name)
+                    self._copy_payload(rows, config, cur)
+                    self._register_ingestion_conn(cur, config, diff.states[filepath])
+
+            conn.commit()
+            self.logger.info("Loading complete!")
 
-                cur.copy_expert(
-                    f"""
-                    COPY {config.schema}.{config.table_name}
-                    (payload, source_filename)
-                    FROM STDIN WITH (FORMAT text)
-                    """,
-                    buffer
-                )
+    def _copy_batches(
+        self,
+        config: EndpointConfig,
+        filepaths: list[Path],
+        states: dict[Path, FileState],
+        cur,
+        batch_rows: Optional[int],
+        batch_bytes: Optional[int],
+    ):
+        """Streams the rows of many files into one COPY per batch.
 
-                self._register_ingestion_conn(cur, config, filepath.name)
+        A batch ends after the file that makes it reach `batch_rows` rows or
+        roughly `batch_bytes` of COPY data, and its files are registered with
+        a single multi-row insert. Rows are generated while COPY reads them, so
+        memory stays bounded by one file regardless of the batch size.
+        """
+        remaining = iter(filepaths)
+        batches = 0
+
+        def batch(first: Path, batch_files: list[Path]) -> Iterator[bytes]:
+            rows = size = 0
+            filepath = first
+            while True:
+                batch_files.append(filepath)
+                for row in self._json_to_rows(filepath, config, filepath.name):
+                    rows += 1
+                    size += len(row)
+                    yield row
+                if (batch_rows and rows >= batch_rows) or (batch_bytes and size >= batch_bytes):
+                    return
+                filepath = next(remaining, None)
+                if filepath is None:
+                    return
+
+        while (first := next(remaining, None)) is not None:
+            batch_files: list[Path] = []
+            self._copy_payload(batch(first, batch_files), config, cur)
+            self._register_ingestion_batch(cur, config, [states[p] for p in batch_files])
+            batches += 1
+
+        self.logger.info(f"Loaded {len(filepaths)} files in {batches} COPY batch(es)")
+
+    def load_files_parallel(
+        self,
+        config: EndpointConfig,
+        filepaths: Iterable[Path],
+        processes: Optional[int] = None,
+        connections: int = 4,
+        files_per_commit: int = 200,
+    ):
+        """Loads multiple files with parsing and COPY running in parallel.
+
+        Files are serialized in a process pool and COPYed by `connections` threads,
+        each on its own connection, as one COPY per chunk. Every chunk of `files_per_commit`
+        files deletes the old rows of its changed files and commits its new rows
+        together with its `raw.nhl_ingestion_control` records, so a failed chunk
+        leaves the table and the bookkeeping as they were and is retried on the
+        next run. Overwrite endpoints must replace the table atomically, so they
+        are loaded by `load_files` instead.
+        """
+        filepaths = list(filepaths)
+        if config.is_overwrite:
+            self.logger.warning(
+                f"overwrite_strategy='{config.overwrite_strategy}' replaces the table in one transaction; loading serially"
+            )
+            self.load_files(config, filepaths)
+            return
 
+        self._ensure_schema(config)
+        with self._connection() as conn, conn.cursor() as cur:
+            new_files, diff = self._plan_load(config, filepaths, cur)
+            self._register_ingestion_batch(cur, config, [diff.states[p] for p in diff.touched])
             conn.commit()
-            self.logger.info("Loading complete!")
+        changed = set(diff.changed)
+
+        if not new_files:
+            return
+
+        chunks = [
+            new_files[i:i + files_per_commit]
+            for i in range(0, len(new_files), files_per_commit)
+        ]
+        worker_conns: queue.Queue[PGConn] = queue.Queue()
+        opened: list[PGConn] = []
+        for _ in range(min(connections, len(chunks))):
+            worker_conn = self._get_connection()
+            opened.append(worker_conn)
+            worker_conns.put(worker_conn)
+
+        def load_chunk(chunk: list[Path], procs: ProcessPoolExecutor) -> int:
+            buffers = procs.map(
+                serialize_file,
+                chunk,
+                [config.array_key] * len(chunk),
+                [p.name for p in chunk],
+                [config.copy_format] * len(chunk),
+            )
+            worker_conn = worker_conns.get()
+            try:
+                with self._transaction(worker_conn), worker_conn.cursor() as worker_cur:
+                    reloaded = [p for p in chunk if p in changed]
+                    if reloaded:
+                        self._delete_file_rows(config, reloaded, worker_cur)
+                    self._copy_payload(buffers, config, worker_cur)
+                    self._register_ingestion_batch(worker_cur, config, [diff.states[p] for p in chunk])
+                return len(chunk)
+            finally:
+                worker_conns.put(worker_conn)
+
+        loaded = 0
+        failed: list[BaseException] = []
+        try:
+            with self._process_pool(processes) as procs, \
+                    ThreadPoolExecutor(max_workers=len(opened)) as threads:
+                futures = [threads.submit(load_chunk, chunk, procs) for chunk in chunks]
+                for future in as_completed(futures):
+                    try:
+                        loaded += future.result()
+                    except Exception as e:
+                        self.logger.error(f"Chunk failed and was rolled back: {e}")
+                        failed.append(e)
+                    self.logger.info(f"Loaded {loaded} of {len(new_files)} files")
+        finally:
+            for worker_conn in opened:
+                self._release_connection(worker_conn)
+
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} of {len(chunks)} chunk(s) failed for "
+                f"{config.schema}.{config.table_name}; {loaded} file(s) loaded"
+            ) from failed[0]
+        self.logger.info("Loading complete!")
+
+    def _load_partition(
+        self,
+        config: EndpointConfig,
+        partition: str,
+        procs: Optional[ProcessPoolExecutor],
+    ) -> int:
+        """Loads one partition in its own connection and transaction; returns the files loaded."""
+        filepaths = config.collect_files(partitions=[partition])
+        if self._uses_merge(config):
+            return self._merge_load(config, filepaths, procs=procs)
+
+        with self._connection() as conn, conn.cursor() as cur:
+            new_files, diff = self._prepare_files(config, filepaths, cur)
+            if new_files:
+                self._copy_payload(self._file_rows(config, new_files, procs), config, cur)
+                self._register_ingestion_batch(cur, config, [diff.states[p] for p in new_files])
+            conn.commit()
+        return len(new_files)
+
+    def load_partitions(
+        self,
+        config: EndpointConfig,
+        partitions: Optional[Iterable[str]] = None,
+        workers: int = 4,
+        processes: Optional[int] = None,
+    ):
+        """Loads partitions (see `EndpointConfig.partition_by`) concurrently.
+
+        Each partition is an independent unit: `workers` threads load one
+        partition at a time on their own connection and commit it on success,
+        so a failed partition is rolled back alone and retried on the next run.
+        JSON serialization runs in a shared process pool of `processes`. DDL is
+        committed once before the workers start. Truncate/swap overwrites
+        replace the whole table and cannot be split by partition.
+
+        Args:
+            config (EndpointConfig): Partitioned endpoint, append or `overwrite_strategy="merge"`
+            partitions (Iterable[str] | None): Partition names; every existing partition when None
+            workers (int): Partitions loaded at the same time (= connections)
+            processes (int | None): Serialization processes; defaults to the number of cores
+        """
+        if config.partition_by is None:
+            raise ValueError(f"{config.table_name} has no partition_by")
+        if config.is_overwrite and not self._uses_merge(config):
+            raise ValueError(
+                f"overwrite_strategy='{config.overwrite_strategy}' replaces the whole table; use load_files"
+            )
+        if partitions is None:
+            partitions = [d.name for d in config.partition_dirs()]
+        partitions = [str(p) for p in partitions]
+        if not partitions:
+            self.logger.warning(f"No partitions found under {config.output_dir}")
+            return
+
+        target = f"{config.schema}.{config.table_name}"
+        self._ensure_schema(config)
+
+        loaded = 0
+        failed: dict[str, BaseException] = {}
+        with self._process_pool(processes) as procs, \
+                ThreadPoolExecutor(max_workers=min(workers, len(partitions))) as threads:
+            futures = {
+                threads.submit(self._load_partition, config, partition, procs): partition
+                for partition in partitions
+            }
+            for future in as_completed(futures):
+                partition = futures[future]
+                try:
+                    count = future.result()
+                except Exception as e:
+                    self.logger.error(f"Partition {partition} failed and was rolled back: {e}")
+                    failed[partition] = e
+                    continue
+                loaded += count
+                self.logger.info(f"Partition {partition} committed ({count} file(s))")
+
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} of {len(partitions)} partition(s) failed for {target}: "
+                f"{', '.join(sorted(failed))}; {loaded} file(s) loaded"
+            ) from next(iter(failed.values()))
+        self.logger.info(f"Loading complete! {len(partitions)} partition(s) loaded into {target}")
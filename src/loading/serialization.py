@@ -0,0 +1,129 @@
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+import json
+import struct
+
+from ..compression import read_bytes
+
+try:
+    import orjson
+except ImportError:  # dependência opcional, acelera parse e dump
+    orjson = None
+
+
+COPY_FORMATS = ("text", "binary")
+
+# PostgreSQL binary COPY: assinatura + flags (int32) + tamanho da extensão do header (int32)
+BINARY_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+BINARY_COPY_TRAILER = struct.pack("!h", -1)
+JSONB_VERSION = b"\x01"
+
+
+def loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def dumps_compact(item: Any) -> bytes:
+    """Compact UTF-8 JSON. Control characters always come out escaped."""
+    if orjson is not None:
+        return orjson.dumps(item)
+    return json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+
+def iter_records(input_path: Path, array_key: str | None) -> list:
+    """Decodes a raw file and returns the list of records to be loaded.
+
+    Raises:
+        ValueError: Invalid JSON in input_path
+        ValueError: Invalid array key or not list of dicts
+    """
+    # .json, .json.gz ou .json.zst
+    raw_bytes = read_bytes(input_path)
+
+    try:
+        data = loads(raw_bytes)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON in file {input_path}: {e}")
+    del raw_bytes
+
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and array_key:
+        if array_key not in data or not isinstance(data[array_key], list):
+            raise ValueError(f"array_key '{array_key}' not found or it is not list of dicts")
+        return data[array_key]
+    return [data]
+
+
+def iter_copy_rows(
+    input_path: Path,
+    array_key: str | None,
+    source_filename: str,
+    copy_format: str = "text",
+) -> Iterator[bytes]:
+    """Yields one PostgreSQL COPY row per JSON record of the file.
+
+    Each record is dumped once. In `text` format it is escaped in a single
+    pass: compact JSON never contains raw newline, CR or tab (they are escaped
+    inside strings), so only backslashes need doubling. In `binary` format no
+    escaping is needed: the tuple is `int16 field count`, then the JSONB field
+    (`int32 length`, version byte 1, UTF-8 JSON) and the TEXT source_filename.
+    Binary rows must be wrapped by `frame_copy_rows`. Uses orjson when installed.
+
+    Args:
+        input_path (Path): JSON file to be serialized (plain, gzip or zstd)
+        array_key (str | None): Parses through provided array key
+        source_filename (str): Metadata
+        copy_format (str): "text" or "binary"
+
+    Raises:
+        ValueError: Invalid JSON in input_path, invalid array key or unserializable record
+
+    Yields:
+        bytes: COPY row for `(payload, source_filename)`
+    """
+    if copy_format not in COPY_FORMATS:
+        raise ValueError(f"copy_format must be one of {COPY_FORMATS}, got '{copy_format}'")
+
+    name = source_filename.encode("utf-8")
+    text_suffix = b"\t" + name + b"\n"
+    binary_name_field = struct.pack("!i", len(name)) + name
+
+    for idx, item in enumerate(iter_records(input_path, array_key), start=1):
+        try:
+            json_bytes = dumps_compact(item)
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"Invalid JSON payload in file {input_path} "
+                f"(record {idx}): {e}"
+            )
+
+        if copy_format == "binary":
+            yield (
+                struct.pack("!hi", 2, len(json_bytes) + 1)
+                + JSONB_VERSION + json_bytes + binary_name_field
+            )
+        else:
+            # Escape para TEXT format do PostgreSQL: \ → \\
+            yield json_bytes.replace(b"\\", b"\\\\") + text_suffix
+
+
+def frame_copy_rows(rows: Iterable[bytes], copy_format: str = "text") -> Iterator[bytes]:
+    """Adds the binary COPY header and trailer around rows; text rows pass through."""
+    if copy_format == "binary":
+        return chain((BINARY_COPY_HEADER,), rows, (BINARY_COPY_TRAILER,))
+    return iter(rows)
+
+
+def serialize_file(
+    input_path: Path,
+    array_key: str | None,
+    source_filename: str,
+    copy_format: str = "text",
+) -> bytes:
+    """Serializes a whole json file into unframed COPY rows (see `iter_copy_rows`).
+
+    Module-level so it can run in a process pool.
+    """
+    return b"".join(iter_copy_rows(input_path, array_key, source_filename, copy_format))
@@ -0,0 +1,228 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic, perf_counter
+from typing import Callable, Iterable, Optional
+import logging
+import queue
+import threading
+
+from ..endpoints import EndpointConfig
+from .loading.loader import Loader
+
+
+@dataclass
+class Step:
+    """One endpoint of the pipeline DAG.
+
+    `extract` runs the extraction and must call the given callback with every
+    file it saves (see `ConcurrentExtractor.run(on_saved=...)`). A step only
+    starts once every step in `depends_on` has been extracted and loaded.
+    """
+    name: str
+    config: EndpointConfig
+    extract: Callable[[Callable[[Path], None]], object]
+    depends_on: tuple[str, ...] = ()
+
+
+class LoadStream:
+    """Loads files into Postgres in a background thread while they are being extracted.
+
+    The table setup (DDL, control table and natural key migration, see
+    `Loader.prepare`) runs once before the first batch. Files are then grouped
+    into `load_files` calls of up to `batch_files` files, or whatever arrived
+    within `interval` seconds, and each batch is planned against its own
+    filenames only. A failed batch is logged and its files stay unregistered
+    in the control table, so the next run loads them; `close()` raises if any
+    batch failed.
+    """
+
+    _DONE = object()
+
+    def __init__(self, loader: Loader, config: EndpointConfig, batch_files: int = 500, interval: float = 30.0):
+        self.loader = loader
+        self.config = config
+        self.batch_files = batch_files
+        self.interval = interval
+        self.loaded = 0
+        self.errors: list[BaseException] = []
+        self.logger = logging.getLogger(__name__)
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"load-{config.table_name}", daemon=True)
+        self._thread.start()
+
+    def put(self, path: Path):
+        self._queue.put(path)
+
+    def _flush(self, batch: list[Path]):
+        if not batch:
+            return
+        try:
+            self.loader.load_files(self.config, batch)
+            self.loaded += len(batch)
+        except Exception as e:
+            self.logger.exception(f"Load of {len(batch)} file(s) into {self.config.table_name} failed")
+            self.errors.append(e)
+
+    def _run(self):
+        try:
+            self.loader.prepare(self.config)
+        except Exception as e:  # cada batch tenta de novo e registra o próprio erro
+            self.logger.exception(f"Setup of {self.config.table_name} failed")
+            self.errors.append(e)
+        batch: list[Path] = []
+        deadline = monotonic() + self.interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - monotonic(), 0))
+            except queue.Empty:
+                item = None
+            if item is self._DONE:
+                self._flush(batch)
+                return
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_files or monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = monotonic() + self.interval
+
+    def close(self) -> int:
+        """Loads what is still queued, stops the thread and returns the files loaded."""
+        self._queue.put(self._DONE)
+        self._thread.join()
+        if self.errors:
+            raise RuntimeError(
+                f"{len(self.errors)} load batch(es) failed for {self.config.table_name}"
+            ) from self.errors[0]
+        return self.loaded
+
+
+class PipelineRunner:
+    """Runs extraction and loading of several endpoints as a DAG.
+
+    Independent steps run at the same time (up to `max_parallel_steps`), and
+    within a step files are loaded while extraction is still running, so a
+    run takes roughly max(extract, load) instead of their sum:
+
+    - append and `overwrite_strategy="merge"` endpoints stream saved files
+      into a `LoadStream`;
+    - truncate/swap overwrites replace the whole table, so they are loaded
+      once with every file after their extraction ends;
+    - static endpoints (no template fields) use `Loader.load`.
+
+    Non-streamed steps are not loaded when their extraction wrote nothing
+    (every request answered 304 or returned the same body).
+
+    A failed step is reported at the end and its dependents are skipped.
+    """
+
+    def __init__(
+        self,
+        loader: Loader,
+        steps: Iterable[Step],
+        max_parallel_steps: int = 3,
+        load_batch_files: int = 500,
+        load_interval: float = 30.0,
+    ):
+        self.loader = loader
+        self.steps = {step.name: step for step in steps}
+        self.max_parallel_steps = max_parallel_steps
+        self.load_batch_files = load_batch_files
+        self.load_interval = load_interval
+        self.logger = logging.getLogger(__name__)
+
+        for step in self.steps.values():
+            missing = set(step.depends_on) - set(self.steps)
+            if missing:
+                raise ValueError(f"Step '{step.name}' depends on unknown step(s): {sorted(missing)}")
+
+    @staticmethod
+    def _streams(config: EndpointConfig) -> bool:
+        return not config.is_overwrite or config.overwrite_strategy == "merge"
+
+    def _run_step(self, step: Step):
+        config = step.config
+        start = perf_counter()
+
+        if self._streams(config) and config.filename_fields():
+            stream = LoadStream(self.loader, config, self.load_batch_files, self.load_interval)
+            try:
+                step.extract(stream.put)
+            finally:
+                loaded = stream.close()
+            self.logger.info(f"[{step.name}] {loaded} file(s) streamed into {config.table_name}")
+        else:
+            written: list[Path] = []
+            step.extract(written.append)
+            if not written:
+                self.logger.info(f"[{step.name}] nothing changed; {config.table_name} not reloaded")
+            elif not config.filename_fields():
+                self.loader.load(config)
+            else:
+                self.loader.load_files(config, config.collect_files())
+
+        self.logger.info(f"[{step.name}] extracted and loaded in {perf_counter() - start:.1f}s")
+
+    def _selected(self, only: Optional[Iterable[str]]) -> set[str]:
+        """`only` plus everything it depends on."""
+        if only is None:
+            return set(self.steps)
+        selected: set[str] = set()
+        pending = list(only)
+        while pending:
+            name = pending.pop()
+            if name not in self.steps:
+                raise ValueError(f"Unknown step '{name}'")
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.steps[name].depends_on)
+        return selected
+
+    def run(self, only: Optional[Iterable[str]] = None):
+        """Runs every step (or `only` those, with their dependencies) in dependency order."""
+        remaining = self._selected(only)
+        done: set[str] = set()
+        failed: dict[str, BaseException] = {}
+        skipped: set[str] = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel_steps) as pool:
+            running: dict[Future, str] = {}
+            while remaining or running:
+                scheduled = True
+                while scheduled:  # repete até propagar skips em cadeia
+                    scheduled = False
+                    for name in sorted(remaining):
+                        deps = set(self.steps[name].depends_on)
+                        if deps & (set(failed) | skipped):
+                            self.logger.warning(f"[{name}] skipped: a dependency failed")
+                            skipped.add(name)
+                        elif deps <= done:
+                            self.logger.info(f"[{name}] starting")
+                            running[pool.submit(self._run_step, self.steps[name])] = name
+                        else:
+                            continue
+                        remaining.discard(name)
+                        scheduled = True
+
+                if not running:
+                    if remaining:
+                        raise ValueError(f"Dependency cycle between steps: {sorted(remaining)}")
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                        done.add(name)
+                    except Exception as e:
+                        self.logger.exception(f"[{name}] failed")
+                        failed[name] = e
+
+        if failed:
+            raise RuntimeError(
+                f"{len(failed)} step(s) failed: {', '.join(sorted(failed))}; "
+                f"skipped: {', '.join(sorted(skipped)) or 'none'}"
+            ) from next(iter(failed.values()))
+        self.logger.info(f"Pipeline complete: {len(done)} step(s)")
@@ -0,0 +1,43 @@
+from pathlib import Path
+import logging
+import os
+
+from ..endpoints import EndpointConfig
+from .extraction.manifest import ExtractionManifest
+
+
+logger = logging.getLogger(__name__)
+
+
+def repartition(config: EndpointConfig, dry_run: bool = False) -> int:
+    """Moves flat files of `config` into their partition folder; returns how many were moved.
+
+    `os.replace` keeps size and mtime, so the ingestion control still sees the
+    files as loaded; their extraction manifest records move with them.
+    """
+    if config.partition_by is None:
+        return 0
+
+    manifest = ExtractionManifest(config.output_dir)
+    moved = 0
+    try:
+        for path in config.collect_files([config.output_dir], use_cache=False):
+            if path.parent != Path(config.output_dir):
+                continue  # já particionado
+            params = config.parse_filename(path.name)
+            if params is None:
+                logger.warning(f"Skipping {path.name}: does not match {config.filename}")
+                continue
+            target = config.resolve_output_dir(**params) / path.name
+            if dry_run:
+                logger.info(f"{path} -> {target}")
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, target)
+                manifest.move(path, target)
+            moved += 1
+    finally:
+        manifest.close()
+
+    logger.info(f"{config.table_name}: {moved} file(s) {'to move' if dry_run else 'moved'}")
+    return moved
@@ -0,0 +1,115 @@
+from fnmatch import translate
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+
+def compile_patterns(patterns: Iterable[str]) -> re.Pattern:
+    """Compiles glob patterns into a single regex matched against file names."""
+    return re.compile("|".join(translate(p) for p in patterns))
+
+
+class DirectoryScanner:
+    """Lists files with `os.scandir`, optionally reusing a persisted snapshot.
+
+    A directory's mtime changes whenever an entry is added, removed or renamed
+    in it (including the atomic rename done by the extractor), so a directory
+    whose `st_mtime_ns` matches the snapshot is not listed again. Snapshots are
+    kept per root in `cache_dir`, which must live outside the scanned tree.
+
+    Directory mtimes come from the kernel's coarse clock, and exFAT/NTFS mounts
+    store them with even coarser granularity, so a file added in the same tick
+    as the listing leaves the mtime unchanged. A snapshot entry is therefore
+    only trusted when the directory had not changed for `settle_seconds` at the
+    time it was listed.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, settle_seconds: float = 5.0):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.settle_ns = int(settle_seconds * 1e9)
+        self.logger = logging.getLogger(__name__)
+
+    def _snapshot_path(self, root: Path) -> Path:
+        digest = hashlib.sha1(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{root.name}_{digest}.json"
+
+    def _load_snapshot(self, root: Path) -> dict:
+        if self.cache_dir is None:
+            return {}
+        try:
+            with self._snapshot_path(root).open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_snapshot(self, root: Path, snapshot: dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_name, self._snapshot_path(root))
+
+    @staticmethod
+    def _list_dir(path: str) -> tuple[list[str], list[str]]:
+        files: list[str] = []
+        dirs: list[str] = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+        return files, dirs
+
+    def iter_files(self, root: Path, patterns: Iterable[str], recursive: bool = False) -> Iterator[Path]:
+        """Lazily yields files under `root` whose name matches any glob pattern."""
+        root = Path(root)
+        if not root.is_dir():
+            return
+
+        matcher = compile_patterns(patterns)
+        previous = self._load_snapshot(root)
+        current: dict = {}
+        rescanned = 0
+        completed = False
+        pending = [str(root)]
+
+        try:
+            while pending:
+                path = pending.pop()
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+
+                cached = previous.get(path)
+                if (
+                    cached
+                    and cached["mtime_ns"] == mtime_ns
+                    and cached.get("listed_at_ns", 0) - mtime_ns >= self.settle_ns
+                ):
+                    files, dirs = cached["files"], cached["dirs"]
+                    listed_at_ns = cached["listed_at_ns"]
+                else:
+                    listed_at_ns = time.time_ns()
+                    files, dirs = self._list_dir(path)
+                    rescanned += 1
+                current[path] = {"mtime_ns": mtime_ns, "listed_at_ns": listed_at_ns, "files": files, "dirs": dirs}
+
+                for name in files:
+                    if matcher.match(name):
+                        yield Path(path, name)
+                if recursive:
+                    pending.extend(os.path.join(path, d) for d in reversed(dirs))
+            completed = True
+        finally:
+            if self.cache_dir is not None and rescanned:
+                # Iteração interrompida: preserva diretórios ainda não visitados
+                self._save_snapshot(root, current if completed else {**previous, **current})
+            self.logger.debug(f"Scanned {root}: {rescanned} of {len(current)} dir(s) listed from disk")
@@ -0,0 +1,84 @@
+import gzip
+import json
+
+import duckdb
+import pytest
+
+from ..endpoints import EndpointConfig
+from ..src.compaction import ParquetCompactor
+
+
+def write(path, data, compress=False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = json.dumps(data).encode()
+    path.write_bytes(gzip.compress(body) if compress else body)
+
+
+def rows(target):
+    return duckdb.sql(
+        f"SELECT payload::VARCHAR, source_filename FROM read_parquet('{target}') ORDER BY ALL"
+    ).fetchall()
+
+
+@pytest.fixture
+def games(tmp_path):
+    config = EndpointConfig(
+        url="https://example.test/games/{game_id}",
+        filename="raw_{game_id}.json",
+        output_dir=tmp_path / "raw/games",
+        table_name="games",
+        file_pattern="raw_*.json",
+        partition_by="season",
+    )
+    write(tmp_path / "raw/games/20232024/raw_2023020001.json", {"id": 1})
+    write(tmp_path / "raw/games/20232024/raw_2023020002.json.gz", {"id": 2}, compress=True)
+    write(tmp_path / "raw/games/20242025/raw_2024020001.json", {"id": 3})
+    return config
+
+
+def test_partitions_are_written_in_hive_layout(tmp_path, games):
+    compactor = ParquetCompactor(tmp_path / "parquet")
+
+    written = compactor.compact(games)
+
+    assert written == [
+        tmp_path / "parquet/games/season=20232024/data.parquet",
+        tmp_path / "parquet/games/season=20242025/data.parquet",
+    ]
+    assert rows(written[0]) == [
+        ('{"id": 1}', "raw_2023020001.json"),
+        ('{"id": 2}', "raw_2023020002.json.gz"),
+    ]
+    seasons = duckdb.sql(
+        f"SELECT DISTINCT season FROM read_parquet('{tmp_path}/parquet/games/*/*.parquet', hive_partitioning = true) "
+        "ORDER BY 1"
+    ).fetchall()
+    assert seasons == [(20232024,), (20242025,)]
+
+
+def test_array_key_is_unnested(tmp_path):
+    config = EndpointConfig(
+        url="https://example.test/team",
+        filename="all_teams_ids.json",
+        output_dir=tmp_path / "raw/single",
+        table_name="teams",
+        array_key="data",
+    )
+    write(tmp_path / "raw/single/all_teams_ids.json", {"data": [{"id": 1}, {"id": 2}], "total": 2})
+    write(tmp_path / "raw/single/all_season_ids.json", [20232024])  # outro endpoint estático
+
+    [target] = ParquetCompactor(tmp_path / "parquet").compact(config)
+
+    assert target == tmp_path / "parquet/teams/data.parquet"
+    assert rows(target) == [('{"id":1}', "all_teams_ids.json"), ('{"id":2}', "all_teams_ids.json")]
+
+
+def test_up_to_date_partitions_are_skipped(tmp_path, games):
+    compactor = ParquetCompactor(tmp_path / "parquet")
+    compactor.compact(games)
+
+    assert compactor.compact(games) == []
+    assert len(compactor.compact(games, force=True)) == 2
+
+    write(tmp_path / "raw/games/20242025/raw_2024020002.json", {"id": 4})
+    assert compactor.compact(games) == [tmp_path / "parquet/games/season=20242025/data.parquet"]
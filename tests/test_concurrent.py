@@ -0,0 +1,101 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ..endpoints import EndpointConfig
+from ..src.extraction.concurrent import ConcurrentExtractor
+from ..src.extraction.extraction import FetchResult
+
+
+class FakeExtractor:
+    """Writes `{"id": ...}` for every request; ids in `missing` return no data, in `failing` an error."""
+
+    def __init__(self, missing=(), delay=0.0, failing=()):
+        self.missing = set(missing)
+        self.failing = set(failing)
+        self.delay = delay
+        self.urls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def fetch_to_file(self, url, output_dir, filename, conditional=False, output_format="json"):
+        with self._lock:
+            self.urls.append(url)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            game_id = url.rsplit("/", 1)[-1]
+            if game_id in self.missing:
+                return FetchResult(None)
+            if game_id in self.failing:
+                return FetchResult(None, error="HTTP 503")
+            path = Path(output_dir) / filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f'{{"id": {game_id}}}')
+            return FetchResult(path, f"hash-{game_id}", changed=True)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def config(tmp_path):
+    return EndpointConfig(
+        url="https://example.test/games/{game_id}",
+        filename="raw_{game_id}.json",
+        output_dir=tmp_path / "games",
+        table_name="games",
+    )
+
+
+def test_run_saves_every_row_and_reports_results(config):
+    fake = FakeExtractor(missing={"3"}, failing={"4"})
+    results = {}
+
+    saved = ConcurrentExtractor(fake, max_workers=2).run(
+        config,
+        ["1", "2", "3", "4"],
+        cols=("game_id",),
+        on_result=lambda row, result: results.__setitem__(row, result),
+    )
+
+    assert sorted(p.name for p in saved) == ["raw_1.json", "raw_2.json"]
+    assert results["3"] == FetchResult(None)
+    assert results["4"].path is None and results["4"].error == "HTTP 503"
+    assert results["1"].path == config.output_dir / "raw_1.json"
+
+
+def test_run_bounds_requests_in_flight(config):
+    fake = FakeExtractor(delay=0.01)
+
+    ConcurrentExtractor(fake, max_workers=3).run(config, (str(i) for i in range(30)), cols=("game_id",))
+
+    assert len(fake.urls) == 30
+    assert fake.max_in_flight <= 3
+
+
+def test_skip_existing_uses_the_manifest(config):
+    ConcurrentExtractor(FakeExtractor(), max_workers=2).run(config, ["1", "2"], cols=("game_id",))
+    fake = FakeExtractor()
+    results = {}
+
+    saved = ConcurrentExtractor(fake, max_workers=2).run(
+        config,
+        ["1", "2", "3"],
+        cols=("game_id",),
+        skip_existing=True,
+        on_result=lambda row, result: results.__setitem__(row, result),
+    )
+
+    assert fake.urls == ["https://example.test/games/3"]
+    assert [p.name for p in saved] == ["raw_3.json"]
+    assert results["1"] == FetchResult(config.output_dir / "raw_1.json")
+
+
+def test_rows_must_match_cols(config):
+    with pytest.raises(ValueError):
+        ConcurrentExtractor(FakeExtractor()).run(config, [("1", "extra")], cols=("game_id",))
@@ -0,0 +1,89 @@
+import pytest
+
+from ..src.extraction.controller import get_data_from_db, iter_data_from_db
+
+
+class NamedCursor:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.itersize = None
+
+    def execute(self, sql):
+        self.db.queries.append((self.name, sql))
+
+    def __iter__(self):
+        self.db.itersize = self.itersize
+        return iter(self.db.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.db.cursor_closed = True
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self, name=None):
+        assert name is not None, "expected a server-side (named) cursor"
+        return NamedCursor(self.db, name)
+
+
+class FakeProvider:
+    """Pool-like provider: `release` is called when the connection goes back."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.itersize = None
+        self.cursor_closed = False
+        self.released = []
+
+    def __call__(self):
+        return FakeConnection(self)
+
+    def release(self, conn):
+        self.released.append(conn)
+
+
+def test_streams_distinct_rows_in_chunks():
+    db = FakeProvider([(1,), (2,)])
+
+    rows = list(iter_data_from_db(
+        "vw_games", ["game_id"], bool_filter=("has_details", False), connection_provider=db, chunk_size=500,
+    ))
+
+    assert rows == [1, 2]
+    assert db.queries == [("iter_vw_games", "SELECT DISTINCT game_id FROM staging.vw_games WHERE has_details IS FALSE")]
+    assert db.itersize == 500
+    assert len(db.released) == 1
+
+
+def test_writes_the_csv_while_streaming(tmp_path):
+    db = FakeProvider([(1, 20232024), (2, 20232024)])
+    output = tmp_path / "out" / "players.csv"
+
+    rows = iter_data_from_db("vw_players", ["player_id", "season_id"], output_csv=output, connection_provider=db)
+
+    assert next(rows) == (1, 20232024)
+    assert list(rows) == [(2, 20232024)]
+    assert output.read_text().splitlines() == ["player_id,season_id", "1,20232024", "2,20232024"]
+
+
+def test_stopping_early_releases_the_connection():
+    db = FakeProvider([(i,) for i in range(10)])
+
+    rows = iter_data_from_db("vw_games", ["game_id"], connection_provider=db)
+    assert next(rows) == 0
+    rows.close()
+
+    assert db.cursor_closed
+    assert len(db.released) == 1
+
+
+def test_unknown_return_as_lists_every_option():
+    with pytest.raises(ValueError, match="'iter'"):
+        get_data_from_db("vw_games", ["game_id"], connection_provider=FakeProvider([]), return_as="set")
@@ -0,0 +1,29 @@
+from ..src.loading.copy_stream import CopyStream
+
+
+def test_reads_across_chunk_boundaries():
+    stream = CopyStream([b"ab", b"", b"cde", b"f"])
+
+    assert stream.read(3) == b"abc"
+    assert stream.read(2) == b"de"
+    assert stream.read(10) == b"f"
+    assert stream.read(10) == b""
+
+
+def test_read_all_and_text_chunks():
+    assert CopyStream(["x\n", "y\n"]).read() == "x\ny\n"
+    assert CopyStream([]).read(5) == ""
+
+
+def test_chunks_are_consumed_lazily():
+    consumed = []
+
+    def chunks():
+        for chunk in (b"1", b"2", b"3"):
+            consumed.append(chunk)
+            yield chunk
+
+    stream = CopyStream(chunks())
+
+    assert stream.read(1) == b"1"
+    assert consumed == [b"1"]
@@ -0,0 +1,63 @@
+import pytest
+import sqlalchemy
+
+from ..src import db
+from ..src.db import PooledConnectionProvider, get_shared_engine, release_connection
+
+
+CREDENTIALS = {"host": "localhost", "port": "5432", "dbname": "nhl", "user": "etl", "password": "secret"}
+
+
+@pytest.fixture(autouse=True)
+def no_engines(monkeypatch):
+    monkeypatch.setattr(db, "_engines", {})
+
+
+def test_one_engine_per_url_and_pool_settings():
+    engine = get_shared_engine(**CREDENTIALS)
+
+    assert get_shared_engine(**CREDENTIALS) is engine
+    assert get_shared_engine(**{**CREDENTIALS, "dbname": "other"}) is not engine
+    assert get_shared_engine(**CREDENTIALS, pool_size=2) is not engine
+    assert engine.url.database == "nhl" and engine.url.port == 5432
+
+
+def test_pool_settings_are_applied():
+    engine = get_shared_engine(**CREDENTIALS, pool_size=3, max_overflow=1, pool_timeout=5, pool_recycle=60)
+
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 1
+    assert engine.pool._timeout == 5
+    assert engine.pool._recycle == 60
+    assert engine.pool._pre_ping
+
+
+def test_release_returns_the_connection_to_the_pool(tmp_path):
+    engine = sqlalchemy.create_engine(
+        f"sqlite:///{tmp_path / 'db.sqlite'}", poolclass=sqlalchemy.pool.QueuePool, pool_size=1, max_overflow=0
+    )
+    provider = PooledConnectionProvider(engine)
+
+    conn = provider()
+    dbapi_conn = conn.driver_connection
+    assert engine.pool.checkedout() == 1
+    release_connection(provider, conn)
+
+    assert engine.pool.checkedout() == 0
+    again = provider()
+    assert again.driver_connection is dbapi_conn  # mesma conexão, não uma nova
+    provider.release(again)
+    engine.dispose()
+
+
+def test_release_leaves_other_providers_alone():
+    class Conn:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    conn = Conn()
+    release_connection(lambda: conn, conn)
+
+    assert not conn.closed
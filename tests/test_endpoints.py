@@ -0,0 +1,107 @@
+import pytest
+
+from ..endpoints import EndpointConfig
+
+
+def config(tmp_path, partition_by="season", **kwargs):
+    return EndpointConfig(
+        url="https://example.test/games/{game_id}",
+        filename="raw_{game_id}.json",
+        output_dir=tmp_path / "games",
+        table_name="games",
+        file_pattern="raw_*.json",
+        partition_by=partition_by,
+        **kwargs,
+    )
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("{}")
+    return path
+
+
+def test_season_partition(tmp_path):
+    games = config(tmp_path)
+
+    assert games.partition_for(game_id=2023020001) == "20232024"
+    assert games.partition_for(game_id="2023020001", season_id=20222023) == "20222023"
+    assert games.resolve_output_dir(game_id=2023020001) == tmp_path / "games" / "20232024"
+
+
+def test_game_type_partition(tmp_path):
+    games = config(tmp_path, partition_by="game_type")
+
+    assert games.partition_for(game_id=2023030114) == "3"
+    assert games.partition_for(game_id=2023030114, game_type_id=2) == "2"
+
+
+def test_hash_partition_is_stable_and_bounded(tmp_path):
+    games = config(tmp_path, partition_by="hash", partition_buckets=8)
+
+    buckets = {games.partition_for(game_id=i) for i in range(100)}
+
+    assert games.partition_for(game_id=1) == games.partition_for(game_id="1")
+    assert buckets <= {f"{b:03d}" for b in range(8)}
+    assert len(buckets) > 1
+
+
+@pytest.mark.parametrize("partition_by, params", [
+    ("season", {"game_id": "123"}),
+    ("season", {}),
+    ("game_type", {"game_id": "20230"}),
+])
+def test_partition_needs_a_long_enough_id(tmp_path, partition_by, params):
+    with pytest.raises(ValueError):
+        config(tmp_path, partition_by=partition_by).partition_for(**params)
+
+
+def test_no_partition(tmp_path):
+    games = config(tmp_path, partition_by=None)
+
+    assert games.partition_for(game_id=2023020001) is None
+    assert games.resolve_output_dir(game_id=2023020001) == tmp_path / "games"
+    with pytest.raises(ValueError):
+        config(tmp_path, partition_by="month").partition_for(game_id=2023020001)
+
+
+def test_iter_files_finds_partitioned_and_flat_files(tmp_path):
+    games = config(tmp_path)
+    base = tmp_path / "games"
+    partitioned = touch(base / "20232024" / "raw_2023020001.json")
+    flat = touch(base / "raw_2023020002.json.gz")
+    other_season = touch(base / "raw_2024020001.json")
+    touch(base / "20242025" / "raw_2024020002.json")
+    touch(base / "notes.txt")
+
+    assert sorted(games.collect_files(partitions=["20232024"])) == sorted([flat, partitioned])
+    assert len(games.collect_files()) == 4
+    assert other_season in games.collect_files(partitions=[20242025])
+    assert games.collect_files(partitions=[]) == []
+    assert games.partition_dirs() == [base / "20232024", base / "20242025"]
+
+
+
+def test_filename_regex(tmp_path):
+    gamelog = EndpointConfig(
+        url="https://example.test/{player_id}/{season_id}/{game_type_id}",
+        filename="{player_id}_{season_id}_{game_type_id}.json",
+        output_dir=tmp_path,
+        table_name="gamelog",
+    )
+
+    assert gamelog.parse_filename("8478402_20232024_2.json.zst") == {
+        "player_id": "8478402", "season_id": "20232024", "game_type_id": "2",
+    }
+    assert gamelog.parse_filename("8478402_20232024_2.jsonx") is None
+
+
+def test_listing_snapshot_is_kept_next_to_output_dir(tmp_path):
+    games = config(tmp_path)
+    files = [touch(tmp_path / "games" / "20232024" / "raw_2023020001.json"), touch(tmp_path / "games" / "raw_2023020002.json")]
+
+    first = games.collect_files(use_cache=True)
+    second = games.collect_files(use_cache=True)
+
+    assert sorted(first) == sorted(second) == sorted(files)
+    assert list((tmp_path / ".scan_cache").glob("games_*.json"))
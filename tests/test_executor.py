@@ -0,0 +1,83 @@
+import pytest
+
+from ..endpoints import EndpointConfig, ParamsSource
+from ..src.extraction.executor import EndpointExecutor
+from ..src.extraction.work_queue import DONE, FAILED, PENDING, WorkQueue
+from .test_concurrent import FakeExtractor
+
+
+@pytest.fixture
+def config(tmp_path):
+    return EndpointConfig(
+        url="https://example.test/games/{game_id}",
+        filename="raw_{game_id}.json",
+        output_dir=tmp_path / "games",
+        table_name="games",
+        params_source=ParamsSource("v_games", ("game_id",), bool_filter=("has_details", False)),
+    )
+
+
+def executor(tmp_path, fake, work_list, max_attempts=3):
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=max_attempts)
+    executor = EndpointExecutor(extractor=fake, from_lake=True, max_workers=2, work_queue=queue)
+    executor.work_list = lambda config: iter(work_list)
+    return executor, queue
+
+
+def test_queue_is_keyed_by_the_params_source(config):
+    assert EndpointExecutor(from_lake=True).queue_name(config) == "games:staging.v_games[has_details=False]"
+
+
+def test_explicit_rows_bypass_the_queue(tmp_path, config):
+    fake = FakeExtractor()
+    executor_, queue = executor(tmp_path, fake, ["1", "2"])
+
+    saved = executor_.run(config, rows=["9"])
+
+    assert [p.name for p in saved] == ["raw_9.json"]
+    assert queue.counts(executor_.queue_name(config)) == {}
+
+
+def test_rows_without_data_are_done_and_errors_failed(tmp_path, config):
+    fake = FakeExtractor(missing={"2"}, failing={"3"})
+    executor_, queue = executor(tmp_path, fake, ["1", "2", "3"], max_attempts=1)
+
+    executor_.run(config)
+
+    assert queue.counts(executor_.queue_name(config)) == {DONE: 2, FAILED: 1}
+
+
+def test_errors_are_retried_until_max_attempts(tmp_path, config):
+    fake = FakeExtractor(failing={"3"})
+    executor_, queue = executor(tmp_path, fake, ["3"], max_attempts=2)
+    name = executor_.queue_name(config)
+
+    executor_.run(config)
+    assert queue.counts(name) == {PENDING: 1}
+
+    executor_.run(config)
+    assert fake.urls == ["https://example.test/games/3"] * 2
+    assert queue.counts(name) == {FAILED: 1}
+
+
+def static_config(tmp_path):
+    return EndpointConfig(
+        url="https://example.test/season",
+        filename="all_season_ids.json",
+        output_dir=tmp_path / "single",
+        table_name="seasons",
+        is_overwrite=True,
+    )
+
+
+def test_static_endpoint_reports_changed_files_only(tmp_path):
+    executor_ = EndpointExecutor(extractor=FakeExtractor(missing={"season"}), from_lake=True)
+
+    assert executor_.run(static_config(tmp_path)) == []
+
+
+def test_failed_static_request_raises(tmp_path):
+    executor_ = EndpointExecutor(extractor=FakeExtractor(failing={"season"}), from_lake=True)
+
+    with pytest.raises(RuntimeError, match="HTTP 503"):
+        executor_.run(static_config(tmp_path))
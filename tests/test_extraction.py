@@ -0,0 +1,54 @@
+import gzip
+import hashlib
+import os
+import stat
+
+import pytest
+
+from ..src.extraction import extraction
+from ..src.extraction.extraction import Extractor, FetchResult
+from .test_http_cache import FakeResponse, FakeTransport
+
+
+URL = "https://example.test/games/1"
+
+
+def fetch(tmp_path, body, filename="raw_1.json"):
+    extractor = Extractor(transport=FakeTransport(FakeResponse(200, body)))
+    return extractor.fetch_to_file(URL, tmp_path, filename)
+
+
+def test_saved_file_follows_the_umask(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction, "FILE_MODE", 0o640)
+
+    path = fetch(tmp_path, b'{"id": 1}').path
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert path.read_bytes() == b'{"id": 1}'
+
+
+def test_default_mode_is_not_owner_only(tmp_path):
+    path = fetch(tmp_path, b"[]").path
+
+    umask = os.umask(0o022)
+    os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+
+def test_stream_to_temp_hashes_the_uncompressed_body(tmp_path):
+    saved, content_hash = Extractor._stream_to_temp([b"  ", b'{"a":', b" 1}"], tmp_path, "x.json.gz", "gzip")
+
+    assert gzip.decompress(saved.read_bytes()) == b'  {"a": 1}'
+    assert content_hash == hashlib.sha256(b'  {"a": 1}').hexdigest()
+
+
+def test_non_json_body_is_rejected_without_leftovers(tmp_path):
+    with pytest.raises(ValueError):
+        Extractor._stream_to_temp([b"<html>error</html>"], tmp_path, "x.json", "json")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_body_saves_nothing(tmp_path):
+    assert fetch(tmp_path, b"") == FetchResult(None)
+    assert list(tmp_path.iterdir()) == []
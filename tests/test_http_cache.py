@@ -0,0 +1,83 @@
+from ..src.extraction.extraction import Extractor
+from ..src.extraction.http_cache import CacheEntry, HttpCache
+
+
+URL = "https://example.test/season"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeTransport:
+    errors = (OSError,)
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, timeout, headers=None, stream=False):
+        self.sent_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_store_and_get_roundtrip(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite")
+
+    assert cache.get(URL) is None
+    cache.store(URL, etag='"v1"', last_modified=None, content_hash="a")
+    cache.store(URL, etag='"v2"', last_modified="Tue, 01 Oct 2024 00:00:00 GMT", content_hash="b")
+
+    assert cache.get(URL) == CacheEntry(URL, '"v2"', "Tue, 01 Oct 2024 00:00:00 GMT", "b")
+    cache.close()
+
+
+def test_conditional_headers():
+    assert HttpCache.conditional_headers(None) == {}
+    assert HttpCache.conditional_headers(CacheEntry(URL, '"v1"', None, "a")) == {"If-None-Match": '"v1"'}
+    assert HttpCache.conditional_headers(CacheEntry(URL, None, "date", "a")) == {"If-Modified-Since": "date"}
+
+
+def test_not_modified_keeps_the_existing_file(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite")
+    transport = FakeTransport(
+        FakeResponse(200, b'{"season": 1}', {"ETag": '"v1"'}),
+        FakeResponse(304),
+    )
+    extractor = Extractor(http_cache=cache, transport=transport)
+
+    first = extractor.extract_to_file(URL, tmp_path / "out", "season.json", conditional=True)
+    mtime = first.stat().st_mtime_ns
+    second = extractor.extract_to_file(URL, tmp_path / "out", "season.json", conditional=True)
+
+    assert second == first
+    assert first.stat().st_mtime_ns == mtime
+    assert transport.sent_headers == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_same_body_without_validators_is_not_rewritten(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite")
+    transport = FakeTransport(FakeResponse(200, b'{"season": 1}'), FakeResponse(200, b'{"season": 1}'))
+    extractor = Extractor(http_cache=cache, transport=transport)
+
+    first = extractor.extract_to_file(URL, tmp_path / "out", "season.json", conditional=True)
+    mtime = first.stat().st_mtime_ns
+    extractor.extract_to_file(URL, tmp_path / "out", "season.json", conditional=True)
+
+    assert first.stat().st_mtime_ns == mtime
+    assert [p.name for p in (tmp_path / "out").iterdir()] == ["season.json"]
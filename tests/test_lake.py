@@ -0,0 +1,102 @@
+import gzip
+import json
+
+import pytest
+
+from .. import endpoints
+from ..src.extraction.lake import LakeCatalog, get_data_from_lake
+
+
+def game(game_id, home, away, state=7, game_type=2):
+    return {
+        "id": game_id,
+        "season": 20232024,
+        "gameType": game_type,
+        "homeTeamId": home,
+        "visitingTeamId": away,
+        "gameStateId": state,
+    }
+
+
+def boxscore(*player_ids):
+    return {
+        "season": 20232024,
+        "gameType": 2,
+        "playerByGameStats": {
+            "awayTeam": {"forwards": [{"playerId": player_ids[0]}], "defense": [], "goalies": []},
+            "homeTeam": {"forwards": [], "defense": [{"playerId": p} for p in player_ids[1:]], "goalies": []},
+        },
+    }
+
+
+def write(path, data, compress=False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = json.dumps(data).encode()
+    path.write_bytes(gzip.compress(body) if compress else body)
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(endpoints, "get_base_path", lambda: str(tmp_path))
+    raw = tmp_path / "raw/nhl"
+    write(
+        raw / "single/all_games_summary.json",
+        {"data": [
+            game(2023020001, 1, 2),
+            game(2023020002, 3, 1),
+            game(2023030001, 1, 3, game_type=3),
+            game(2023020003, 2, 3, state=1),  # ainda não encerrado
+        ]},
+    )
+    # partição por temporada, layout plano e .json.gz
+    write(raw / "raw_all_games_details/20232024/raw_2023020001_details.json", boxscore(10, 11))
+    write(raw / "raw_all_games_details/raw_2023020002_details.json.gz", boxscore(11, 12), compress=True)
+    write(raw / "raw_all_games_summary_details/raw_2023020001_summary_details.json", {})
+    write(raw / "raw_play_by_play/20232024/raw_2023020002.json.gz", {}, compress=True)
+
+    catalog = LakeCatalog()
+    yield catalog
+    catalog.close()
+
+
+def test_games_view_flags_extracted_files(catalog):
+    rows = catalog.con.execute(
+        "SELECT * FROM vw_stg_request_games_id ORDER BY game_id"
+    ).fetchall()
+
+    assert rows == [
+        (2023020001, 20232024, 2, True, True, False),
+        (2023020002, 20232024, 2, True, False, True),
+        (2023030001, 20232024, 3, False, False, False),
+    ]
+
+
+def test_teams_view(catalog):
+    rows = catalog.con.execute(
+        "SELECT * FROM vw_stg_request_teams_seasons_gametypes_id ORDER BY ALL"
+    ).fetchall()
+
+    assert rows == [
+        (1, 20232024, 2), (1, 20232024, 3), (2, 20232024, 2), (3, 20232024, 2), (3, 20232024, 3),
+    ]
+
+
+def test_players_views_read_plain_and_compressed_boxscores(catalog):
+    players = catalog.con.execute("SELECT player_id FROM vw_stg_request_players_id ORDER BY 1").fetchall()
+    seasons = catalog.con.execute(
+        "SELECT DISTINCT * FROM vw_stg_request_players_seasons_gametypes_id ORDER BY 1"
+    ).fetchall()
+
+    assert players == [(10,), (11,), (12,)]
+    assert seasons == [(10, 20232024, 2), (11, 20232024, 2), (12, 20232024, 2)]
+
+
+def test_get_data_from_lake_applies_the_bool_filter(catalog):
+    rows = get_data_from_lake(
+        "vw_stg_request_games_id",
+        ["game_id"],
+        bool_filter=("has_play_by_play", False),
+        catalog=catalog,
+    )
+
+    assert sorted(rows) == [2023020001, 2023030001]
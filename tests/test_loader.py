@@ -0,0 +1,401 @@
+import pytest
+
+from ..endpoints import EndpointConfig
+from ..src.extraction.manifest import file_sha256
+from ..src.loading.loader import Loader
+
+
+class RecordingCursor:
+    """Records SQL, COPY data and control records, and answers the catalog and
+    control-table lookups the Loader makes from the `RecordingDatabase` settings."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = conn
+        self.db = conn.db
+        self.rowcount = 0
+        self._result = []
+
+    def execute(self, sql, params=None):
+        if isinstance(sql, bytes):
+            sql = sql.decode()
+        sql = " ".join(sql.split())
+        self.conn.record(sql, params)
+        self.rowcount = 0
+        db = self.db
+        if "information_schema.columns" in sql and "'nhl_ingestion_control'" in sql:
+            self._result = [(db.columns,)]
+        elif "information_schema.columns" in sql:
+            self._result = [(db.key_columns,)]
+        elif "to_regclass" in sql:
+            self._result = [(db.key_index,)]
+        elif sql.startswith("SELECT filename, content_hash"):
+            self._result = [r for r in db.control if r[0] in params[2]]
+        elif sql.startswith("SELECT filename FROM raw.nhl_ingestion_control"):
+            self._result = [(r[0],) for r in db.control if r[0] not in params[2]]
+        elif "pg_get_userbyid(relowner)" in sql:
+            self._result = [db.owner]
+        elif "aclexplode" in sql:
+            self._result = list(db.grants)
+        elif "pg_depend" in sql:
+            self._result = list(db.views)
+        elif "IS NULL" in sql and sql.startswith("SELECT count(*)"):
+            self._result = [(0,)]
+        else:
+            self._result = []
+            if sql.startswith("DELETE FROM") and sql.endswith("IS NULL"):
+                self.rowcount = db.legacy_rows
+
+    def mogrify(self, template, args):
+        # execute_values monta o INSERT do controle com mogrify: registra o filename
+        self.conn.record("register", args[2])
+        return repr(args).encode()
+
+    def copy_expert(self, sql, stream, size=8192):
+        sql = " ".join(sql.split())
+        chunks = []
+        while chunk := stream.read(size):
+            chunks.append(chunk)
+        self.conn.record(sql, None)
+        self.db.copies.append((sql, b"".join(chunks)))
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return list(self._result)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class RecordingConnection:
+    encoding = "UTF8"
+
+    def __init__(self, db):
+        self.db = db
+        self.pending = []
+
+    def record(self, sql, params):
+        self.db.statements.append((sql, params))
+        self.pending.append((sql, params))
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.db.commits += 1
+        self.db.transactions.append(("commit", self.pending))
+        self.pending = []
+
+    def rollback(self):
+        self.db.transactions.append(("rollback", self.pending))
+        self.pending = []
+
+    def close(self):
+        pass
+
+
+class RecordingDatabase:
+    def __init__(self, columns=3, key_columns=0, key_index=None):
+        self.columns = columns
+        self.key_columns = key_columns
+        self.key_index = key_index
+        self.legacy_rows = 0
+        self.owner = ('"etl"', False)
+        self.grants = []
+        self.views = []
+        self.statements = []
+        self.commits = 0
+        self.transactions = []
+        self.control = []
+        self.copies = []
+
+    def __call__(self):
+        return RecordingConnection(self)
+
+    def executed(self, fragment):
+        return [sql for sql, _ in self.statements if fragment in sql]
+
+    def registered(self, statements=None):
+        statements = self.statements if statements is None else statements
+        return [params for sql, params in statements if sql == "register"]
+
+    def committed(self):
+        return [statements for outcome, statements in self.transactions if outcome == "commit"]
+
+    def mark_loaded(self, *paths):
+        for path in paths:
+            stat = path.stat()
+            self.control.append((path.name, file_sha256(path), stat.st_size, stat.st_mtime_ns))
+
+
+def write(path, text="{}"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+@pytest.fixture
+def config(tmp_path):
+    return EndpointConfig(
+        url="https://example.test/players/{player_id}",
+        filename="raw_{player_id}.json",
+        output_dir=tmp_path,
+        table_name="players",
+        file_pattern="raw_*.json",
+    )
+
+
+def test_schema_setup_runs_once_per_loader(config):
+    db = RecordingDatabase()
+    loader = Loader(connection_provider=db)
+
+    loader._ensure_schema(config)
+    loader._ensure_schema(config)
+
+    assert len(db.executed("CREATE TABLE IF NOT EXISTS raw.players")) == 1
+    assert db.executed("ALTER TABLE raw.nhl_ingestion_control") == []
+
+
+def test_control_table_is_migrated_only_when_columns_are_missing(config):
+    db = RecordingDatabase(columns=0)
+
+    Loader(connection_provider=db)._ensure_schema(config)
+
+    assert len(db.executed("ALTER TABLE raw.nhl_ingestion_control")) == 1
+
+
+def test_planning_reads_only_the_records_of_the_files_given(config, tmp_path):
+    db = RecordingDatabase()
+    loader = Loader(connection_provider=db)
+    files = [tmp_path / "raw_1.json", tmp_path / "raw_2.json"]
+    for path in files:
+        path.write_text("{}")
+
+    with loader._connection() as conn, conn.cursor() as cur:
+        to_load, diff = loader._plan_load(config, files, cur)
+
+    (sql, params), = [(s, p) for s, p in db.statements if s.startswith("SELECT filename, content_hash")]
+    assert "filename = ANY(%s)" in sql
+    assert params[2] == ["raw_1.json", "raw_2.json"]
+    assert to_load == files and diff.removed == set()
+
+
+@pytest.fixture
+def gamelog(tmp_path):
+    return EndpointConfig(
+        url="https://example.test/{player_id}/{season_id}/{game_type_id}",
+        filename="{player_id}_{season_id}_{game_type_id}.json",
+        output_dir=tmp_path / "gamelog",
+        table_name="gamelog",
+        file_pattern="*_*_*.json",
+        search_recursive=True,
+        partition_by="season",
+        is_overwrite=True,
+        overwrite_strategy="merge",
+        natural_key=("player_id", "season_id", "game_type_id"),
+    )
+
+
+def test_merge_upserts_by_the_key_parsed_from_the_filename(gamelog):
+    db = RecordingDatabase(key_columns=3, key_index="index")
+    files = [write(gamelog.output_dir / "8478402_20232024_2.json"), write(gamelog.output_dir / "8478402_20232024_3.json")]
+
+    assert Loader(connection_provider=db)._merge_load(gamelog, files) == 2
+
+    [copy_sql] = db.executed("COPY pg_temp.gamelog__merge")
+    [(merge_sql, params)] = [(s, p) for s, p in db.statements if "ON CONFLICT" in s and "INSERT INTO raw.gamelog" in s]
+    assert "(payload, source_filename) FROM STDIN" in copy_sql
+    assert "m[1] AS player_id, m[2] AS season_id, m[3] AS game_type_id" in merge_sql
+    assert "ON CONFLICT (player_id, season_id, game_type_id) DO UPDATE" in merge_sql
+    assert "WHERE t.payload IS DISTINCT FROM EXCLUDED.payload" in merge_sql
+    assert params == (gamelog.filename_regex(),)
+    assert db.executed("DROP TABLE pg_temp.gamelog__merge")
+    assert db.registered() == ["8478402_20232024_2.json", "8478402_20232024_3.json"]
+    assert db.executed("ALTER TABLE raw.gamelog") == []  # chave já existe
+
+
+def test_merge_skips_files_already_loaded(gamelog):
+    db = RecordingDatabase(key_columns=3, key_index="index")
+    loaded = write(gamelog.output_dir / "1_20232024_2.json")
+    new = write(gamelog.output_dir / "2_20232024_2.json")
+    db.mark_loaded(loaded)
+
+    Loader(connection_provider=db)._merge_load(gamelog, [loaded, new])
+
+    [(_, data)] = db.copies
+    assert b"2_20232024_2.json" in data and b"1_20232024_2.json" not in data
+
+
+def test_natural_key_migration_reloads_every_file_once(gamelog):
+    db = RecordingDatabase(key_columns=0, key_index=None)
+    db.legacy_rows = 5
+    on_disk = [write(gamelog.output_dir / "20232024" / f"{p}_20232024_2.json") for p in (1, 2)]
+    given = write(gamelog.output_dir / "3_20232024_2.json")
+    loader = Loader(connection_provider=db)
+
+    loader._merge_load(gamelog, [given])
+    loader._merge_load(gamelog, [given])
+
+    assert db.executed("ALTER TABLE raw.gamelog ADD COLUMN IF NOT EXISTS") == [
+        f"ALTER TABLE raw.gamelog ADD COLUMN IF NOT EXISTS {key} TEXT" for key in gamelog.natural_key
+    ]
+    assert db.executed("CREATE UNIQUE INDEX IF NOT EXISTS gamelog_natural_key_uidx") == [
+        "CREATE UNIQUE INDEX IF NOT EXISTS gamelog_natural_key_uidx ON raw.gamelog (player_id, season_id, game_type_id)"
+    ]
+    assert db.executed("DELETE FROM raw.gamelog WHERE player_id IS NULL")
+    assert db.executed("DELETE FROM raw.nhl_ingestion_control")
+    # a migração recarrega todos os arquivos do endpoint, não só os do batch
+    migration = db.committed()[0]
+    assert sorted(db.registered(migration)) == sorted(p.name for p in [*on_disk, given])
+
+
+def test_merge_requires_the_key_in_the_filename(gamelog):
+    bad = EndpointConfig(**{**gamelog.__dict__, "natural_key": ("team_id",)})
+
+    with pytest.raises(ValueError):
+        Loader(connection_provider=RecordingDatabase()).prepare(bad)
+
+
+@pytest.fixture
+def club_stats(tmp_path):
+    return EndpointConfig(
+        url="https://example.test/{team_id}",
+        filename="club_{team_id}.json",
+        output_dir=tmp_path / "club",
+        table_name="club_stats",
+        file_pattern="club_*.json",
+        is_overwrite=True,
+        overwrite_strategy="swap",
+    )
+
+
+def test_swap_keeps_the_table_when_no_file_changed(club_stats):
+    db = RecordingDatabase()
+    files = [write(club_stats.output_dir / "club_1.json")]
+    db.mark_loaded(*files)
+
+    Loader(connection_provider=db).load_files(club_stats, files)
+
+    assert db.executed("__staging") == []
+    assert db.executed("RENAME") == []
+    assert db.executed("TRUNCATE") == []
+
+
+def test_swap_builds_staging_then_renames_and_restores_grants_and_views(club_stats):
+    db = RecordingDatabase()
+    db.owner = ('"etl"', True)
+    db.grants = [("reporting", "SELECT", False), ("PUBLIC", "SELECT", True)]
+    db.views = [("staging.vw_club_stats", " SELECT payload FROM raw.club_stats;")]
+    files = [write(club_stats.output_dir / f"club_{i}.json", f'{{"team": {i}}}') for i in (1, 2)]
+
+    Loader(connection_provider=db).load_files(club_stats, files)
+
+    ddl = [
+        sql for sql, _ in db.statements
+        if sql.startswith(("DROP", "CREATE TABLE raw.club_stats__staging", "COPY", "ALTER TABLE", "GRANT", "CREATE OR REPLACE VIEW"))
+    ]
+    assert ddl == [
+        "DROP TABLE IF EXISTS raw.club_stats__staging",
+        "CREATE TABLE raw.club_stats__staging (LIKE raw.club_stats INCLUDING ALL)",
+        "COPY raw.club_stats__staging (payload, source_filename) FROM STDIN WITH (FORMAT text, ENCODING 'UTF8')",
+        "ALTER TABLE raw.club_stats RENAME TO club_stats__old",
+        "ALTER TABLE raw.club_stats__staging RENAME TO club_stats",
+        'ALTER TABLE raw.club_stats OWNER TO "etl"',
+        "GRANT SELECT ON raw.club_stats TO reporting",
+        "GRANT SELECT ON raw.club_stats TO PUBLIC WITH GRANT OPTION",
+        "CREATE OR REPLACE VIEW staging.vw_club_stats AS SELECT payload FROM raw.club_stats;",
+        "DROP TABLE raw.club_stats__old",
+    ]
+    [(_, data)] = db.copies
+    assert b"club_1.json" in data and b"club_2.json" in data
+    assert db.executed("TRUNCATE") == []
+
+
+def test_swap_replaces_the_control_records_with_the_rename(club_stats):
+    db = RecordingDatabase()
+    kept = write(club_stats.output_dir / "club_1.json")
+    db.mark_loaded(kept)
+    db.control.append(("club_9.json", "gone", 2, 0))  # arquivo que sumiu
+    files = [kept, write(club_stats.output_dir / "club_2.json")]
+
+    Loader(connection_provider=db).load_files(club_stats, files)
+
+    [swap] = [t for t in db.committed() if any(sql.startswith("ALTER TABLE raw.club_stats RENAME") for sql, _ in t)]
+    statements = [sql for sql, _ in swap]
+    clear = statements.index(
+        "DELETE FROM raw.nhl_ingestion_control WHERE table_schema=%s AND table_name=%s"
+    )
+    assert clear > statements.index("DROP TABLE raw.club_stats__old")
+    assert db.registered(swap) == ["club_1.json", "club_2.json"]
+    assert db.executed("COPY raw.club_stats__staging") and not any(
+        sql.startswith("COPY") for sql in statements
+    )
+
+
+def test_partitions_commit_independently(tmp_path):
+    details = EndpointConfig(
+        url="https://example.test/games/{game_id}",
+        filename="raw_{game_id}_details.json",
+        output_dir=tmp_path / "details",
+        table_name="details",
+        file_pattern="raw_*_details.json",
+        partition_by="season",
+    )
+    base = details.output_dir
+    write(base / "20222023" / "raw_2022020001_details.json")
+    write(base / "20232024" / "raw_2023020001_details.json", "<html>")  # JSON inválido
+    write(base / "20242025" / "raw_2024020001_details.json")
+    write(base / "20242025" / "raw_2024020002_details.json")
+    db = RecordingDatabase()
+
+    with pytest.raises(RuntimeError, match="1 of 3 partition"):
+        Loader(connection_provider=db).load_partitions(details, workers=2, processes=1)
+
+    loads = [t for t in db.committed() if db.registered(t)]
+    assert sorted(sorted(db.registered(t)) for t in loads) == [
+        ["raw_2022020001_details.json"],
+        ["raw_2024020001_details.json", "raw_2024020002_details.json"],
+    ]
+    [failed] = [statements for outcome, statements in db.transactions if outcome == "rollback"]
+    assert db.registered(failed) == []
+    assert "raw_2023020001_details.json" not in {name for t in loads for name in db.registered(t)}
+
+
+def test_copy_batches_end_after_the_file_reaching_batch_rows(tmp_path):
+    teams = EndpointConfig(
+        url="https://example.test/teams/{season_id}",
+        filename="teams_{season_id}.json",
+        output_dir=tmp_path / "teams",
+        table_name="teams",
+        file_pattern="teams_*.json",
+        array_key="data",
+    )
+    files = [
+        write(teams.output_dir / "teams_1.json", '{"data": [{"id": 1}, {"id": 2}]}'),
+        write(teams.output_dir / "teams_2.json", '{"data": [{"id": 3}, {"id": 4}]}'),
+        write(teams.output_dir / "teams_3.json", '{"data": [{"id": 5}]}'),
+    ]
+    db = RecordingDatabase()
+
+    Loader(connection_provider=db).load_files(teams, files, batch_rows=3)
+
+    assert [data.count(b"\n") for _, data in db.copies] == [4, 1]
+    order = [sql if sql != "register" else params for sql, params in db.statements if sql.startswith("COPY") or sql == "register"]
+    assert [o if not o.startswith("COPY") else "COPY" for o in order] == [
+        "COPY", "teams_1.json", "teams_2.json", "COPY", "teams_3.json",
+    ]
+
+
+def test_batching_is_ignored_with_a_warning_for_merge(gamelog, caplog):
+    db = RecordingDatabase(key_columns=3, key_index="index")
+    files = [write(gamelog.output_dir / f"{p}_20232024_2.json") for p in (1, 2, 3)]
+
+    Loader(connection_provider=db).load_files(gamelog, files, batch_rows=1)
+
+    assert len(db.copies) == 1
+    assert "batch_rows/batch_bytes are ignored" in caplog.text
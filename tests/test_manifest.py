@@ -0,0 +1,36 @@
+import gzip
+import hashlib
+import sqlite3
+
+from ..src.extraction.manifest import MANIFEST_FILENAME, ExtractionManifest, body_sha256
+
+
+def test_records_are_visible_before_close(tmp_path):
+    manifest = ExtractionManifest(tmp_path)
+    path = tmp_path / "20242025" / "raw_1.json"
+    path.parent.mkdir()
+    path.write_bytes(b"{}")
+
+    manifest.record(path, "abc")
+
+    # outro processo (ex.: após SIGKILL) já enxerga o registro
+    with sqlite3.connect(tmp_path / MANIFEST_FILENAME) as conn:
+        assert conn.execute("SELECT relpath, content_hash FROM extracted_files").fetchall() == [
+            ("20242025/raw_1.json", "abc")
+        ]
+    assert manifest.contains(path)
+    manifest.close()
+
+
+def test_record_without_hash_hashes_the_decompressed_body(tmp_path):
+    path = tmp_path / "raw_1.json.gz"
+    path.write_bytes(gzip.compress(b'{"id": 1}'))
+    manifest = ExtractionManifest(tmp_path)
+
+    manifest.record(path)
+
+    expected = hashlib.sha256(b'{"id": 1}').hexdigest()
+    assert body_sha256(path) == expected
+    with sqlite3.connect(tmp_path / MANIFEST_FILENAME) as conn:
+        assert conn.execute("SELECT content_hash FROM extracted_files").fetchone() == (expected,)
+    manifest.close()
@@ -0,0 +1,134 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from ..endpoints import EndpointConfig
+from ..src.pipeline import LoadStream, PipelineRunner, Step
+
+
+class FakeLoader:
+    def __init__(self, fail_tables=()):
+        self.fail_tables = set(fail_tables)
+        self.calls: list[tuple] = []
+        self._lock = threading.Lock()
+
+    def _record(self, *call):
+        with self._lock:
+            self.calls.append(call)
+
+    def prepare(self, config):
+        self._record("prepare", config.table_name)
+
+    def load(self, config):
+        self._record("load", config.table_name)
+
+    def load_files(self, config, filepaths):
+        if config.table_name in self.fail_tables:
+            raise RuntimeError("load failed")
+        self._record("load_files", config.table_name, len(list(filepaths)))
+
+    def of(self, kind):
+        return [c for c in self.calls if c[0] == kind]
+
+
+def dynamic(name, **kwargs):
+    return EndpointConfig(
+        url=f"https://example.test/{name}/{{game_id}}",
+        filename=f"{name}_{{game_id}}.json",
+        output_dir=Path("/nonexistent") / name,
+        table_name=name,
+        **kwargs,
+    )
+
+
+def static(name):
+    return EndpointConfig(
+        url=f"https://example.test/{name}",
+        filename=f"{name}.json",
+        output_dir=Path("/nonexistent"),
+        table_name=name,
+        is_overwrite=True,
+    )
+
+
+def extracting(order, name, files=1):
+    def extract(on_saved):
+        order.append(name)
+        for i in range(files):
+            on_saved(Path(f"/nonexistent/{name}_{i}.json"))
+    return extract
+
+
+def test_steps_run_after_their_dependencies():
+    order = []
+    steps = [
+        Step("details", dynamic("details"), extracting(order, "details"), depends_on=("summary",)),
+        Step("players", dynamic("players"), extracting(order, "players"), depends_on=("details", "seasons")),
+        Step("summary", static("summary"), extracting(order, "summary")),
+        Step("seasons", static("seasons"), extracting(order, "seasons")),
+    ]
+
+    PipelineRunner(FakeLoader(), steps, max_parallel_steps=2).run()
+
+    assert order.index("summary") < order.index("details") < order.index("players")
+    assert order.index("seasons") < order.index("players")
+
+
+def test_failed_step_skips_its_dependents_only():
+    order = []
+    loader = FakeLoader(fail_tables={"details"})
+    steps = [
+        Step("details", dynamic("details"), extracting(order, "details")),
+        Step("players", dynamic("players"), extracting(order, "players"), depends_on=("details",)),
+        Step("gamelog", dynamic("gamelog"), extracting(order, "gamelog"), depends_on=("players",)),
+        Step("teams", static("teams"), extracting(order, "teams")),
+    ]
+
+    with pytest.raises(RuntimeError):
+        PipelineRunner(loader, steps).run()
+
+    assert sorted(order) == ["details", "teams"]
+
+
+def test_only_selects_dependencies():
+    order = []
+    steps = [
+        Step("summary", static("summary"), extracting(order, "summary")),
+        Step("details", dynamic("details"), extracting(order, "details"), depends_on=("summary",)),
+        Step("teams", static("teams"), extracting(order, "teams")),
+    ]
+
+    PipelineRunner(FakeLoader(), steps).run(only=["details"])
+
+    assert order == ["summary", "details"]
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        PipelineRunner(FakeLoader(), [Step("a", static("a"), extracting([], "a"), depends_on=("b",))])
+
+
+def test_unchanged_static_step_is_not_reloaded():
+    loader = FakeLoader()
+    steps = [
+        Step("seasons", static("seasons"), extracting([], "seasons", files=0)),
+        Step("teams", static("teams"), extracting([], "teams", files=1)),
+    ]
+
+    PipelineRunner(loader, steps).run()
+
+    assert loader.of("load") == [("load", "teams")]
+
+
+def test_stream_prepares_once_and_loads_in_batches():
+    loader = FakeLoader()
+    stream = LoadStream(loader, dynamic("gamelog"), batch_files=2, interval=60)
+
+    for i in range(5):
+        stream.put(Path(f"/nonexistent/gamelog_{i}.json"))
+
+    assert stream.close() == 5
+    assert loader.calls[0] == ("prepare", "gamelog")
+    assert loader.of("prepare") == [("prepare", "gamelog")]
+    assert [c[2] for c in loader.of("load_files")] == [2, 2, 1]
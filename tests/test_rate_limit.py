@@ -0,0 +1,123 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ..src.extraction.extraction import Extractor
+from ..src.extraction.rate_limit import RateLimiter, TokenBucket, parse_retry_after
+from ..src.extraction.transport import RequestsTransport
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    in_ten = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+    assert 8 <= parse_retry_after(in_ten) <= 10
+
+
+def test_bucket_starts_full_then_waits_for_refill():
+    bucket = TokenBucket(rate=2.0, capacity=2)
+
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == 0.0
+    assert 0 < bucket._reserve() <= 0.5
+
+
+def test_aimd_rate_adjustment():
+    bucket = TokenBucket(rate=4.0, max_rate=4.2, increase_step=0.1, decrease_factor=0.5, cooldown=60)
+
+    bucket.on_success()
+    bucket.on_success()
+    bucket.on_success()
+    assert bucket.rate == pytest.approx(4.2)  # limitado por max_rate
+
+    bucket.on_throttle()
+    bucket.on_throttle()  # mesma rajada, dentro do cooldown: conta uma vez
+    assert bucket.rate == pytest.approx(2.1)
+
+
+def test_throttle_blocks_until_retry_after():
+    bucket = TokenBucket(rate=100.0)
+
+    bucket.on_throttle(retry_after=5)
+
+    assert 4.9 < bucket._reserve() <= 5
+
+
+def test_buckets_are_per_host():
+    limiter = RateLimiter(host_rates={"a.test": 1.0}, default_rate=3.0)
+
+    assert limiter.bucket("https://a.test/x") is limiter.bucket("https://a.test/y")
+    assert limiter.bucket("https://a.test/x").rate == 1.0
+    assert limiter.bucket("https://b.test/x").rate == 3.0
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTransport:
+    errors = (OSError,)
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def get(self, url, timeout, headers=None, stream=False):
+        self.calls += 1
+        return FakeResponse(self.statuses.pop(0), {"Retry-After": "0"})
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.events = []
+
+    def acquire(self, url):
+        self.events.append("acquire")
+
+    def on_success(self, url):
+        self.events.append("success")
+
+    def on_throttle(self, url, retry_after=None):
+        self.events.append("throttle")
+
+
+@pytest.mark.parametrize(
+    "status, expected",
+    [(200, "success"), (304, "success"), (404, None), (503, None)],
+)
+def test_only_2xx_and_304_count_as_success(status, expected):
+    limiter = RecordingLimiter()
+    extractor = Extractor(rate_limiter=limiter, transport=FakeTransport([status]))
+
+    assert extractor._get("https://a.test/x", timeout=1).status_code == status
+    assert limiter.events == ["acquire"] + ([expected] if expected else [])
+
+
+def test_throttled_retries_report_every_attempt():
+    limiter = RecordingLimiter()
+    transport = FakeTransport([429, 429, 429])
+    extractor = Extractor(rate_limiter=limiter, max_throttle_retries=2, transport=transport)
+
+    response = extractor._get("https://a.test/x", timeout=1)
+
+    assert response.status_code == 429 and not response.closed
+    assert transport.calls == 3
+    assert limiter.events == ["acquire", "throttle"] * 3
+
+
+def test_transport_leaves_throttling_to_the_limiter():
+    retry = RequestsTransport(retry_throttled=False).session.get_adapter("https://a.test").max_retries
+
+    assert 429 not in retry.status_forcelist
+    assert not retry.is_retry("GET", 429, has_retry_after=True)
+    assert retry.is_retry("GET", 503)
@@ -0,0 +1,51 @@
+import sqlite3
+
+from ..endpoints import EndpointConfig
+from ..src.extraction.manifest import MANIFEST_FILENAME, ExtractionManifest
+from ..src.repartition import repartition
+
+
+def test_flat_files_move_with_their_manifest_records(tmp_path):
+    games = EndpointConfig(
+        url="https://example.test/games/{game_id}",
+        filename="raw_{game_id}.json",
+        output_dir=tmp_path,
+        table_name="games",
+        file_pattern="raw_*.json",
+        partition_by="season",
+    )
+    manifest = ExtractionManifest(tmp_path)
+    for name in ("raw_2023020001.json", "raw_2024020001.json.gz"):
+        (tmp_path / name).write_text("{}")
+        manifest.record(tmp_path / name, f"hash-{name}")
+    manifest.close()
+    (tmp_path / "20232024").mkdir()
+    (tmp_path / "20232024" / "raw_2023020002.json").write_text("{}")  # já particionado
+    (tmp_path / "raw_unknown.txt").write_text("")
+
+    assert repartition(games, dry_run=True) == 2
+    assert (tmp_path / "raw_2023020001.json").exists()
+
+    assert repartition(games) == 2
+    assert repartition(games) == 0
+
+    assert (tmp_path / "20232024" / "raw_2023020001.json").exists()
+    assert (tmp_path / "20242025" / "raw_2024020001.json.gz").exists()
+    with sqlite3.connect(tmp_path / MANIFEST_FILENAME) as conn:
+        rows = conn.execute("SELECT relpath, content_hash FROM extracted_files ORDER BY 1").fetchall()
+    assert rows == [
+        ("20232024/raw_2023020001.json", "hash-raw_2023020001.json"),
+        ("20242025/raw_2024020001.json.gz", "hash-raw_2024020001.json.gz"),
+    ]
+
+
+def test_move_records_an_unknown_file(tmp_path):
+    manifest = ExtractionManifest(tmp_path)
+    (tmp_path / "a").mkdir()
+    target = tmp_path / "a" / "raw_1.json"
+    target.write_bytes(b"{}")
+
+    manifest.move(tmp_path / "raw_1.json", target)
+
+    assert manifest.relpaths() == {"a/raw_1.json"}
+    manifest.close()
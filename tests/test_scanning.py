@@ -0,0 +1,92 @@
+import os
+import time
+
+import pytest
+
+from ..src.scanning import DirectoryScanner
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "raw"
+    (root / "20232024").mkdir(parents=True)
+    (root / "20242025").mkdir()
+    for path in (
+        root / "raw_1.json",
+        root / "notes.txt",
+        root / "20232024" / "raw_2.json.gz",
+        root / "20242025" / "raw_3.json",
+    ):
+        path.write_text("{}")
+    return root
+
+
+def settle(*dirs):
+    """Backdates directory mtimes, as if they had not changed for a minute."""
+    old = time.time() - 60
+    for d in dirs:
+        os.utime(d, (old, old))
+
+
+def count_listings(scanner, monkeypatch):
+    calls = []
+    list_dir = scanner._list_dir
+
+    def counting(path):
+        calls.append(path)
+        return list_dir(path)
+
+    monkeypatch.setattr(scanner, "_list_dir", counting)
+    return calls
+
+
+def names(paths):
+    return sorted(p.name for p in paths)
+
+
+def test_lists_matching_files(tree):
+    scanner = DirectoryScanner()
+
+    assert names(scanner.iter_files(tree, ["raw_*.json", "raw_*.json.gz"])) == ["raw_1.json"]
+    assert names(scanner.iter_files(tree, ["raw_*.json", "raw_*.json.gz"], recursive=True)) == [
+        "raw_1.json", "raw_2.json.gz", "raw_3.json",
+    ]
+
+
+def test_settled_directories_are_served_from_the_snapshot(tree, tmp_path, monkeypatch):
+    settle(tree, tree / "20232024", tree / "20242025")
+    scanner = DirectoryScanner(tmp_path / "cache")
+    list(scanner.iter_files(tree, ["*.json"], recursive=True))
+    calls = count_listings(scanner, monkeypatch)
+
+    found = names(scanner.iter_files(tree, ["*.json"], recursive=True))
+
+    assert found == ["raw_1.json", "raw_3.json"]
+    assert calls == []
+
+
+def test_recently_modified_directories_are_listed_again(tree, tmp_path, monkeypatch):
+    settle(tree, tree / "20232024")
+    scanner = DirectoryScanner(tmp_path / "cache")
+    season = tree / "20242025"
+    mtime = season.stat().st_mtime_ns
+    list(scanner.iter_files(tree, ["*.json"], recursive=True))
+    # arquivo criado no mesmo "tick" da listagem: o mtime do diretório não muda
+    (season / "raw_4.json").write_text("{}")
+    os.utime(season, ns=(mtime, mtime))
+    calls = count_listings(scanner, monkeypatch)
+
+    found = names(scanner.iter_files(tree, ["*.json"], recursive=True))
+
+    assert "raw_4.json" in found
+    assert calls == [str(tree / "20242025")]
+
+
+def test_changed_directories_are_listed_again(tree, tmp_path):
+    settle(tree, tree / "20232024", tree / "20242025")
+    scanner = DirectoryScanner(tmp_path / "cache")
+    list(scanner.iter_files(tree, ["*.json"], recursive=True))
+
+    (tree / "20232024" / "raw_5.json").write_text("{}")
+
+    assert "raw_5.json" in names(scanner.iter_files(tree, ["*.json"], recursive=True))
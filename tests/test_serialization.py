@@ -0,0 +1,74 @@
+import json
+import struct
+
+import pytest
+
+from ..src.loading.serialization import (
+    BINARY_COPY_HEADER,
+    BINARY_COPY_TRAILER,
+    frame_copy_rows,
+    iter_copy_rows,
+    serialize_file,
+)
+
+
+def parse_binary_copy(data: bytes) -> list[tuple[dict, str]]:
+    """Decodes a binary COPY stream of (jsonb payload, text source_filename) tuples."""
+    assert data.startswith(BINARY_COPY_HEADER) and data.endswith(BINARY_COPY_TRAILER)
+    body = memoryview(data)[len(BINARY_COPY_HEADER):-len(BINARY_COPY_TRAILER)]
+    rows, pos = [], 0
+    while pos < len(body):
+        (fields,) = struct.unpack_from("!h", body, pos)
+        assert fields == 2
+        pos += 2
+        (size,) = struct.unpack_from("!i", body, pos)
+        pos += 4
+        assert body[pos] == 1  # versão do JSONB
+        payload = json.loads(bytes(body[pos + 1:pos + size]))
+        pos += size
+        (size,) = struct.unpack_from("!i", body, pos)
+        pos += 4
+        rows.append((payload, bytes(body[pos:pos + size]).decode("utf-8")))
+        pos += size
+    return rows
+
+
+@pytest.fixture
+def games_file(tmp_path):
+    path = tmp_path / "games.json"
+    path.write_text(json.dumps({"data": [{"id": 1, "name": "Montréal"}, {"id": 2, "note": "a\\b\tc\n"}]}))
+    return path
+
+
+def test_binary_rows_frame_into_a_valid_copy_stream(games_file):
+    data = b"".join(frame_copy_rows(iter_copy_rows(games_file, "data", "games.json", "binary"), "binary"))
+
+    assert parse_binary_copy(data) == [
+        ({"id": 1, "name": "Montréal"}, "games.json"),
+        ({"id": 2, "note": "a\\b\tc\n"}, "games.json"),
+    ]
+
+
+def test_text_rows_escape_backslashes_only(games_file):
+    rows = list(iter_copy_rows(games_file, "data", "games.json"))
+
+    assert rows[0] == '{"id":1,"name":"Montréal"}\tgames.json\n'.encode("utf-8")
+    assert rows[1] == b'{"id":2,"note":"a\\\\\\\\b\\\\tc\\\\n"}\tgames.json\n'
+    assert list(frame_copy_rows(rows)) == rows
+
+
+def test_serialize_file_matches_the_row_iterator(games_file):
+    assert serialize_file(games_file, "data", "g", "binary") == b"".join(
+        iter_copy_rows(games_file, "data", "g", "binary")
+    )
+
+
+def test_invalid_inputs(tmp_path, games_file):
+    with pytest.raises(ValueError):
+        list(iter_copy_rows(games_file, "missing", "g"))
+    with pytest.raises(ValueError):
+        list(iter_copy_rows(games_file, "data", "g", "csv"))
+    broken = tmp_path / "broken.json"
+    broken.write_text("{")
+    with pytest.raises(ValueError):
+        list(iter_copy_rows(broken, None, "broken.json"))
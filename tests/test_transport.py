@@ -0,0 +1,33 @@
+import pytest
+
+from ..src.extraction.transport import RETRY_STATUSES, THROTTLE_STATUSES, HttpxTransport, RequestsTransport
+
+
+def test_requests_pool_size_reaches_the_adapter():
+    transport = RequestsTransport(pool_maxsize=32)
+
+    assert transport.session.get_adapter("https://api-web.nhle.com")._pool_maxsize == 32
+
+
+def test_httpx_limits_reach_the_connection_pool():
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+
+    transport = HttpxTransport(http2=True, max_connections=32, max_keepalive_connections=16)
+    pool = transport.client._transport._pool
+
+    assert isinstance(transport.client._transport, httpx.HTTPTransport)
+    assert pool._max_connections == 32
+    assert pool._max_keepalive_connections == 16
+    assert pool._http2 is True
+    transport.close()
+
+
+def test_httpx_leaves_throttling_to_the_limiter():
+    pytest.importorskip("httpx")
+
+    transport = HttpxTransport(http2=False, retry_throttled=False)
+
+    assert transport.retry_statuses == RETRY_STATUSES
+    assert not set(THROTTLE_STATUSES) & set(transport.retry_statuses)
+    transport.close()
@@ -0,0 +1,60 @@
+from ..src.extraction.work_queue import DONE, FAILED, IN_FLIGHT, PENDING, WorkQueue
+
+
+def rows(*ids):
+    return lambda: ({"game_id": i} for i in ids)
+
+
+def test_populate_then_resume_ignores_the_new_work_list(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+
+    assert queue.populate("games", rows(1, 2, 3)) is True
+    assert queue.populate("games", rows(4)) is False
+
+    assert [item.params for item in queue.lease("games", 10)] == [{"game_id": 1}, {"game_id": 2}, {"game_id": 3}]
+    assert queue.counts("games") == {IN_FLIGHT: 3}
+
+
+def test_drained_queue_is_populated_again(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.populate("games", rows(1))
+    for item in queue.consume("games"):
+        queue.complete(item)
+
+    assert queue.populate("games", rows(2, 3)) is True
+    assert queue.counts("games") == {PENDING: 2}
+
+
+def test_expired_lease_is_leased_again(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", lease_seconds=-1)
+    queue.populate("games", rows(1))
+
+    first = queue.lease("games", 10)
+    second = queue.lease("games", 10)
+
+    assert [item.key for item in second] == [item.key for item in first]
+    assert second[0].attempts == 2
+
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=2)
+    queue.populate("games", rows(1))
+
+    queue.fail(queue.lease("games", 1)[0], "HTTP 503")
+    assert queue.counts("games") == {PENDING: 1}
+
+    queue.fail(queue.lease("games", 1)[0], "HTTP 503")
+    assert queue.counts("games") == {FAILED: 1}
+    assert queue.lease("games", 1) == []
+
+
+def test_queues_are_independent(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.populate("games:a", rows(1, 2))
+    queue.populate("games:b", rows(3))
+
+    for item in queue.consume("games:a"):
+        queue.complete(item)
+
+    assert queue.counts("games:a") == {DONE: 2}
+    assert queue.counts("games:b") == {PENDING: 1}